@@ -6,51 +6,383 @@ Endpoints:
     GET /api/financial-report?symbol=RELIANCE - Scrape financial report data
 """
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from flask import Flask, request
+from flask_compress import Compress
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
 import asyncio
+import atexit
+import concurrent.futures
+import functools
+import hashlib
+import orjson
 import os
+import threading
+import time
 import urllib.parse
+import nse_http
+from browser_pool import BrowserPool
+from cache import FileCache, RedisCache, make_key
 from equity_quote_run import scrape_equity_quote
 from finiancialReport import scrape_with_search
+import metrics
 
 app = Flask(__name__)
-# Enable CORS for all origins
-# This explicitly allows http://localhost:5173 along with all other origins (*)
-# Note: CORS(app) allows all origins, which includes http://localhost:5173
-CORS(app, resources={
-    r"/*": {
-        "origins": "*",  # Allows all origins including http://localhost:5173
-        "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
-    }
-})
+# Prometheus metrics at /metrics, outside Flask's routing
+app.wsgi_app = DispatcherMiddleware(app.wsgi_app, {'/metrics': metrics.metrics_app})
+
+# Compress JSON bodies; tiny ones (e.g. /health) are left alone. Scrape bodies
+# are streamed, and flask-compress leaves gzip out for streams unless listed
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_ALGORITHM_STREAMING'] = ['zstd', 'br', 'gzip', 'deflate']
+Compress(app)
+
+# CORS policy is fixed (all origins, including http://localhost:5173), so the
+# headers are precomputed and stamped on every response
+_CORS_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, POST, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type, Authorization'),
+)
+
+
+@app.after_request
+def _add_cors_headers(response):
+    for name, value in _CORS_HEADERS:
+        response.headers[name] = value
+    return response
+
+
+@app.before_request
+def _preflight():
+    """Answer CORS preflight requests for any path; other methods route as usual."""
+    if request.method == 'OPTIONS':
+        return '', 204
+
 
 # Default output directory
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Headless default when the request has no 'headless' param (true for production)
+FORCE_HEADLESS = os.getenv("FORCE_HEADLESS", "true").lower() == "true"
 
-def run_async(coro):
-    """Helper function to run async functions in Flask with gevent compatibility"""
-    try:
-        # Try to get the current event loop
-        loop = asyncio.get_event_loop()
-        if loop.is_closed():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+# Format: https://www.nseindia.com/get-quote/equity/{SYMBOL}/{COMPANY-SLUG}
+EQUITY_URL_TMPL = "https://www.nseindia.com/get-quote/equity/{symbol}/{slug}"
+# Fixed NSE financial results URL
+FINANCIAL_URL = "https://www.nseindia.com/companies-listing/corporate-filings-financial-results-comparision"
+
+# Response cache; quotes are only meaningful at a coarse tick, results change quarterly
+RESPONSE_CACHE = FileCache(os.path.join(os.path.dirname(__file__), ".cache"))
+# With REDIS_URL set, entries are shared by every worker/pod; the file cache stays as fallback
+if os.getenv("REDIS_URL"):
+    RESPONSE_CACHE = RedisCache(os.environ["REDIS_URL"], fallback=RESPONSE_CACHE)
+EQUITY_CACHE_TTL = float(os.getenv("EQUITY_CACHE_TTL", "60"))
+FINANCIAL_CACHE_TTL = float(os.getenv("FINANCIAL_CACHE_TTL", str(24 * 60 * 60)))
+
+# Max seconds a request waits for its scrape before giving up
+SCRAPE_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "600"))
+
+# Shared pool of warm headless browser contexts (size defaults to CPU count)
+POOL = BrowserPool(
+    size=int(os.getenv("POOL_SIZE", os.cpu_count() or 1)),
+    cookie_ttl=float(os.getenv("COOKIE_TTL", "600"))
+)
+
+metrics.POOL_SIZE.set(POOL.size)
+
+# Distinct scrapes allowed at once (running plus waiting for a pooled context);
+# past this, requests get 503 instead of piling up behind the pool
+MAX_PENDING_SCRAPES = int(os.getenv("MAX_PENDING_SCRAPES", str(POOL.size * 2)))
+# Seconds a rejected client is told to wait before retrying
+BUSY_RETRY_AFTER = int(os.getenv("BUSY_RETRY_AFTER", "30"))
+
+# One event loop, running forever in a background thread, drives every scrape.
+# Under gevent (wsgi.py) that thread is a greenlet on the worker's hub, which is
+# what lets the loop spawn Playwright's driver subprocess and run to_thread work
+LOOP = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _shutdown():
+    POOL.close_sync()
+    LOOP.call_soon_threadsafe(LOOP.stop)
+
+
+def get_loop():
+    """
+    Return the shared scrape loop, starting it on first use.
+
+    Started lazily rather than at import so each forked gunicorn worker runs
+    its own loop thread instead of inheriting loop state from the master.
+    """
+    global LOOP
+    with _LOOP_LOCK:
+        if LOOP is None:
+            LOOP = asyncio.new_event_loop()
+            threading.Thread(target=LOOP.run_forever, name="scrape-loop", daemon=True).start()
+            atexit.register(_shutdown)
+        return LOOP
+
+
+@functools.lru_cache(maxsize=1024)
+def build_equity_url(symbol: str, company_name: str) -> str:
+    """NSE quote URL for ``symbol``; memoized since a handful of symbols dominate traffic."""
+    # Normalize the company slug: strip, replace spaces with hyphens, URL-encode safely
+    slug = urllib.parse.quote(company_name.strip().replace(" ", "-"), safe="-")
+    return EQUITY_URL_TMPL.format(symbol=symbol, slug=slug)
+
+
+def json_response(body, status: int = 200):
+    """Serialize ``body`` with orjson (much faster than stdlib json on large scraped payloads)."""
+    with metrics.JSON_ENCODE_SECONDS.time():
+        payload = orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS)
+    return app.response_class(payload, status=status, mimetype='application/json')
+
+
+def _iter_json(value, depth: int):
+    """Yield ``value`` as JSON chunks, splitting dicts/lists into one chunk per entry ``depth`` levels down."""
+    if depth and isinstance(value, dict) and value:
+        sep = b'{'
+        for key, item in value.items():
+            yield sep + orjson.dumps(str(key)) + b':'
+            yield from _iter_json(item, depth - 1)
+            sep = b','
+        yield b'}'
+    elif depth and isinstance(value, list) and value:
+        sep = b'['
+        for item in value:
+            yield sep
+            yield from _iter_json(item, depth - 1)
+            sep = b','
+        yield b']'
+    else:
+        yield orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _timed_chunks(chunks):
+    """Pass ``chunks`` through, recording only the time spent producing them (not sending)."""
+    spent = 0.0
+    chunks = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            break
+        finally:
+            spent += time.perf_counter() - start
+        yield chunk
+    metrics.JSON_ENCODE_SECONDS.observe(spent)
+
+
+def stream_json_response(body, status: int = 200, depth: int = 3):
+    """
+    Stream ``body`` as JSON, encoding it piece by piece as the socket drains.
+
+    Used for scrape payloads (``data``/``parsed_data``), so a large parsed table
+    is never held as one fully encoded buffer alongside the dict.
+    """
+    return app.response_class(_timed_chunks(_iter_json(body, depth)), status=status, mimetype='application/json')
+
+
+def etag_response(body, *key_parts, max_age: int = 30):
+    """
+    Stream ``body`` with an ETag, or answer 304 when the client already holds it.
+
+    The tag hashes the request key with the scrape timestamp: a body only changes
+    when a new scrape produces it, so the payload itself never needs encoding up front.
+    It is weak because the bytes vary with the negotiated compression; flask-compress
+    would otherwise append the encoding to a strong tag and break revalidation.
+    """
+    tag = hashlib.blake2b(
+        "|".join(str(p) for p in (*key_parts, body.get('timestamp'))).encode("utf-8"),
+        digest_size=16
+    ).hexdigest()
+    if request.if_none_match.contains_weak(tag):
+        response = app.response_class(status=304)
+    else:
+        response = stream_json_response(body)
+    response.set_etag(tag, weak=True)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
+
+
+def busy_response():
+    """503 telling the client to retry once the scrape queue has drained."""
+    response = json_response({
+        "status": "busy",
+        "error": "Too many scrapes in progress, retry later"
+    }, 503)
+    response.headers['Retry-After'] = str(BUSY_RETRY_AFTER)
+    return response
+
+
+def _bool_arg(name: str, default: bool) -> bool:
+    """Read a true/false query parameter, falling back to ``default`` when absent."""
+    value = request.args.get(name)
+    return default if value is None else value.lower() == 'true'
+
+
+# Scrapes in flight, keyed by endpoint + params; identical concurrent requests share one.
+# Each entry is [future, number of requests waiting on it]
+INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+metrics.INFLIGHT_SCRAPES.set_function(lambda: sum(not f.done() for f, _ in list(INFLIGHT.values())))
+
+
+class ScrapeQueueFull(Exception):
+    """Raised when MAX_PENDING_SCRAPES distinct scrapes are already running or queued."""
+
+
+def run_shared(key: str, make_coro):
+    """
+    Run ``make_coro()`` on the shared background loop and wait for its result.
+
+    If an identical scrape (same ``key``) is already running, wait for that one
+    instead of starting another. Raises ScrapeQueueFull rather than starting a
+    new scrape once MAX_PENDING_SCRAPES are pending.
     
-    # Run the coroutine
+    A request that times out stops waiting; the shared scrape is only cancelled
+    when no other request is still waiting for it.
+    """
+    with _INFLIGHT_LOCK:
+        entry = INFLIGHT.get(key)
+        if entry is None or entry[0].done():
+            if sum(not f.done() for f, _ in INFLIGHT.values()) >= MAX_PENDING_SCRAPES:
+                raise ScrapeQueueFull(f"{MAX_PENDING_SCRAPES} scrapes already pending")
+            entry = [asyncio.run_coroutine_threadsafe(make_coro(), get_loop()), 0]
+            INFLIGHT[key] = entry
+        entry[1] += 1
+        future = entry[0]
+    try:
+        return future.result(timeout=SCRAPE_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        raise TimeoutError(f"Scrape did not finish within {SCRAPE_TIMEOUT:g} seconds")
+    finally:
+        with _INFLIGHT_LOCK:
+            entry[1] -= 1
+            if entry[1] == 0:
+                # Last waiter gone: nobody needs an unfinished scrape any more
+                future.cancel()
+                if INFLIGHT.get(key) is entry:
+                    del INFLIGHT[key]
+
+
+async def cached_flow(endpoint: str, cache_key: str, ttl: float, coro) -> tuple:
+    """
+    Await an endpoint flow and store a successful body in the response cache.
+
+    The write (disk, and Redis when configured) runs on a worker thread so it
+    never stalls the shared loop; a failed write is logged and the body is
+    still returned.
+    """
+    body, status = await coro
+    if status == 200:
+        try:
+            await asyncio.to_thread(RESPONSE_CACHE.set, endpoint, cache_key, body, ttl)
+        except Exception as e:
+            print(f"[WARN] Response cache write failed: {e}")
+    return body, status
+
+
+async def scrape_pooled(scraper, headless: bool, **kwargs) -> dict:
+    """
+    Run ``scraper`` in a context (and its long-lived page) borrowed from the browser pool.
+
+    Non-headless runs (and calls the pool cannot serve) launch their own
+    browser as before.
+    """
+    if headless:
+        with metrics.POOL_WAIT_SECONDS.time():
+            context = await POOL.acquire()
+    else:
+        context = None
+    if context is None:
+        return await scraper(headless=headless, **kwargs)
+    metrics.POOL_IN_USE.inc()
     try:
-        return loop.run_until_complete(coro)
-    except RuntimeError as e:
-        # If there's a runtime error, create a new event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        return loop.run_until_complete(coro)
+        # Pooled contexts carry the pool's NSE cookies, so skip the homepage hop
+        result = await scraper(
+            context=context,
+            page=POOL.page_for(context),
+            headless=headless,
+            prime_cookies=not POOL.cookies,
+            **kwargs
+        )
+        if result.get('cookies_expired'):
+            POOL.expire_cookies()
+        return result
+    finally:
+        metrics.POOL_IN_USE.dec()
+        await POOL.release(context)
+
+
+def artifact_paths(result: dict) -> dict:
+    """Paths of the screenshot/HTML/JSON files the scraper actually wrote."""
+    return {key: result[key] for key in ("screenshot", "html", "json") if result.get(key)}
+
+
+async def equity_quote(symbol: str, url: str, with_returns: bool = False, **kwargs) -> tuple:
+    """
+    Scrape one equity quote and build the ``(body, status)`` API response.
+
+    The JSON API behind the HTTP fast path has no period returns, so
+    ``with_returns`` always renders the page.
+    """
+    result = None
+    # Plain HTTP is enough unless the caller wants the page itself (screenshot/HTML), the returns or a visible browser
+    if kwargs.get('headless') and not kwargs.get('take_screenshot') and not kwargs.get('persist') and not with_returns:
+        try:
+            result = await nse_http.fetch_quote(symbol, url)
+        except nse_http.FallbackNeeded as e:
+            print(f"[WARN] HTTP fast path failed, falling back to browser: {e}")
+    if result is None:
+        result = await scrape_pooled(scrape_equity_quote, url=url, try_http=False, **kwargs)
+    
+    if result.get('status') == 'error':
+        return {
+            "status": "error",
+            "error": result.get('error', 'Unknown error occurred')
+        }, 500
+    
+    # Return success response with parsed data
+    return {
+        "status": "success",
+        "symbol": symbol,
+        "url": result.get('url'),
+        "data": result.get('data', {}),
+        **artifact_paths(result),
+        "timestamp": result.get('timestamp')
+    }, 200
+
+
+async def financial_report(symbol: str, url: str, **kwargs) -> tuple:
+    """
+    Scrape one financial report and build the ``(body, status)`` API response.
+
+    Always rendered in the browser: NSE's results API only covers part of the
+    page's line items (see ``nse_http.fetch_financial_report``).
+    """
+    result = await scrape_pooled(scrape_with_search, url=url, search_term=symbol, **kwargs)
+    
+    if result.get('status') == 'error':
+        return {
+            "status": "error",
+            "error": result.get('error', 'Unknown error occurred')
+        }, 500
+    
+    # Return success response with parsed data
+    return {
+        "status": "success",
+        "symbol": result.get('search_term'),
+        "parsed_data": result.get('parsed_data', {}),
+        **artifact_paths(result),
+        "timestamp": result.get('timestamp')
+    }, 200
 
 
 @app.route('/api/equity-quote', methods=['GET'])
@@ -63,6 +395,9 @@ def get_equity_quote():
         name   (required): Company slug as shown in NSE URL (e.g., Reliance-Industries-Limited)
         headless (optional): Run browser in headless mode (default: true)
         take_screenshot (optional): Save screenshot (default: false)
+        persist (optional): Save rendered HTML and parsed JSON to output_dir (default: false)
+        returns (optional): Include the period returns in data, which needs the browser (default: false)
+        nocache (optional): Skip the response cache and force a fresh scrape (default: false)
     
     Example:
         GET /api/equity-quote?symbol=RELIANCE
@@ -72,9 +407,9 @@ def get_equity_quote():
             "status": "success",
             "symbol": "RELIANCE",
             "data": { ... parsed equity data ... },
-            "screenshot": "path/to/screenshot.png",
-            "html": "path/to/html.html",
-            "json": "path/to/json.json"
+            "screenshot": "path/to/screenshot.png",  (only with take_screenshot=true)
+            "html": "path/to/html.html",             (only with persist=true)
+            "json": "path/to/json.json"              (only with persist=true)
         }
     """
     try:
@@ -83,70 +418,67 @@ def get_equity_quote():
         company_name = request.args.get('name')
         
         if not symbol:
-            return jsonify({
+            return json_response({
                 "status": "error",
                 "error": "Missing required query parameter: 'symbol'"
-            }), 400
+            }, 400)
         if not company_name:
-            return jsonify({
+            return json_response({
                 "status": "error",
                 "error": "Missing required query parameter: 'name' (e.g., Reliance-Industries-Limited)"
-            }), 400
+            }, 400)
         
         symbol = symbol.upper().strip()
-        # Normalize the company slug: strip, replace spaces with hyphens, URL-encode safely
-        company_slug = company_name.strip().replace(" ", "-")
-        company_slug = urllib.parse.quote(company_slug, safe="-")
-        
         # Construct NSE equity quote URL from symbol + name
-        # Format: https://www.nseindia.com/get-quote/equity/{SYMBOL}/{COMPANY-SLUG}
-        url = f"https://www.nseindia.com/get-quote/equity/{symbol}/{company_slug}"
+        url = build_equity_url(symbol, company_name)
         
-        # Headless: check query parameter first, then env variable
-        # Query parameter takes precedence for local development
-        headless_param = request.args.get('headless')
-        if headless_param is not None:
-            headless = headless_param.lower() == 'true'
-        else:
-            # If no query param, check environment variable (defaults to true for production)
-            headless_env = os.getenv("FORCE_HEADLESS", "true").lower() == "true"
-            headless = headless_env
-        take_screenshot = request.args.get('take_screenshot', 'false').lower() == 'true'  # Default to False to save resources
+        # Headless: query parameter takes precedence over FORCE_HEADLESS (for local development)
+        headless = _bool_arg('headless', FORCE_HEADLESS)
+        take_screenshot = _bool_arg('take_screenshot', False)  # Default to False to save resources
+        persist = _bool_arg('persist', False)  # Keep artifacts in memory unless asked
         output_dir = request.args.get('output_dir', OUTPUT_DIR)
+        # Returns are only on the rendered page, so they get their own cache entry
+        with_returns = _bool_arg('returns', False)
+        # Artifact requests always scrape so their files exist
+        artifacts = take_screenshot or persist
+        use_cache = not _bool_arg('nocache', False) and not artifacts
         
-        # Run the async scraper
-        result = run_async(
-            scrape_equity_quote(
-                url=url,
-                output_dir=output_dir,
-                headless=headless,
-                take_screenshot=take_screenshot
-            )
-        )
-        
-        if result.get('status') == 'error':
-            return jsonify({
-                "status": "error",
-                "error": result.get('error', 'Unknown error occurred')
-            }), 500
+        cache_key = make_key(url, "returns") if with_returns else make_key(url)
+        if use_cache:
+            with metrics.CACHE_LOOKUP_SECONDS.labels("equity-quote").time():
+                cached = RESPONSE_CACHE.get("equity-quote", cache_key, EQUITY_CACHE_TTL)
+            if cached is not None:
+                return etag_response(cached, "equity-quote", cache_key, artifacts)
         
-        # Return success response with parsed data
-        return jsonify({
-            "status": "success",
-            "symbol": symbol,
-            "url": result.get('url'),
-            "data": result.get('data', {}),
-            "screenshot": result.get('screenshot'),
-            "html": result.get('html'),
-            "json": result.get('json'),
-            "timestamp": result.get('timestamp')
-        }), 200
+        # Run the whole scrape flow on the shared loop in one hop (or join an identical one)
+        flow = functools.partial(
+            equity_quote,
+            symbol=symbol,
+            url=url,
+            with_returns=with_returns,
+            output_dir=output_dir,
+            headless=headless,
+            take_screenshot=take_screenshot,
+            persist=persist
+        )
+        start = time.perf_counter()
+        body, status = run_shared(
+            f"equity-quote:{cache_key}:{headless:d}{take_screenshot:d}{persist:d}:{output_dir}",
+            flow if artifacts else lambda: cached_flow("equity-quote", cache_key, EQUITY_CACHE_TTL, flow())
+        )
+        if status != 200:
+            return json_response(body, status)
+        # Only successful scrapes are timed; failures would skew the latency buckets
+        metrics.SCRAPE_SECONDS.labels("equity-quote").observe(time.perf_counter() - start)
+        return etag_response(body, "equity-quote", cache_key, artifacts)
         
+    except ScrapeQueueFull:
+        return busy_response()
     except Exception as e:
-        return jsonify({
+        return json_response({
             "status": "error",
             "error": str(e)
-        }), 500
+        }, 500)
 
 
 @app.route('/api/financial-report', methods=['GET'])
@@ -157,6 +489,9 @@ def get_financial_report():
     Query Parameters:
         symbol (required): Stock symbol (e.g., RELIANCE, TCS, INFY)
         headless (optional): Run browser in headless mode (default: true; enforced if FORCE_HEADLESS=true)
+        take_screenshot (optional): Save screenshot (default: false)
+        persist (optional): Save rendered HTML and parsed JSON to output_dir (default: false)
+        nocache (optional): Skip the response cache and force a fresh scrape (default: false)
     
     Example:
         GET /api/financial-report?symbol=RELIANCE
@@ -166,9 +501,9 @@ def get_financial_report():
             "status": "success",
             "symbol": "RELIANCE",
             "parsed_data": { ... financial data ... },
-            "screenshot": "path/to/screenshot.png",
-            "html": "path/to/html.html",
-            "json": "path/to/json.json"
+            "screenshot": "path/to/screenshot.png",  (only with take_screenshot=true)
+            "html": "path/to/html.html",             (only with persist=true)
+            "json": "path/to/json.json"              (only with persist=true)
         }
     """
     try:
@@ -176,93 +511,99 @@ def get_financial_report():
         symbol = request.args.get('symbol')
         
         if not symbol:
-            return jsonify({
+            return json_response({
                 "status": "error",
                 "error": "Missing required query parameter: 'symbol'"
-            }), 400
+            }, 400)
         
         symbol = symbol.upper().strip()
         output_dir = request.args.get('output_dir', OUTPUT_DIR)
-        # Headless: check query parameter first, then env variable
-        # Query parameter takes precedence for local development
-        headless_param = request.args.get('headless')
-        if headless_param is not None:
-            headless = headless_param.lower() == 'true'
-        else:
-            # If no query param, check environment variable (defaults to true for production)
-            headless_env = os.getenv("FORCE_HEADLESS", "true").lower() == "true"
-            headless = headless_env
+        # Headless: query parameter takes precedence over FORCE_HEADLESS (for local development)
+        headless = _bool_arg('headless', FORCE_HEADLESS)
+        take_screenshot = _bool_arg('take_screenshot', False)
+        persist = _bool_arg('persist', False)
+        # Artifact requests always scrape so their files exist
+        artifacts = take_screenshot or persist
+        use_cache = not _bool_arg('nocache', False) and not artifacts
         
-        # Fixed NSE financial results URL
-        url = "https://www.nseindia.com/companies-listing/corporate-filings-financial-results-comparision"
+        # "page" keeps reports cached from the old partial HTTP fast path from being served
+        cache_key = make_key(symbol, "page")
+        if use_cache:
+            with metrics.CACHE_LOOKUP_SECONDS.labels("financial-report").time():
+                cached = RESPONSE_CACHE.get("financial-report", cache_key, FINANCIAL_CACHE_TTL)
+            if cached is not None:
+                return etag_response(cached, "financial-report", cache_key, artifacts)
         
-        # Run the async scraper
-        result = run_async(
-            scrape_with_search(
-                url=url,
-                search_term=symbol,
-                output_dir=output_dir,
-                headless=headless
-            )
+        # Run the whole scrape flow on the shared loop in one hop (or join an identical one)
+        flow = functools.partial(
+            financial_report,
+            symbol=symbol,
+            url=FINANCIAL_URL,
+            output_dir=output_dir,
+            headless=headless,
+            take_screenshot=take_screenshot,
+            persist=persist
         )
+        start = time.perf_counter()
+        body, status = run_shared(
+            f"financial-report:{cache_key}:{headless:d}{take_screenshot:d}{persist:d}:{output_dir}",
+            flow if artifacts else lambda: cached_flow("financial-report", cache_key, FINANCIAL_CACHE_TTL, flow())
+        )
+        if status != 200:
+            return json_response(body, status)
+        # Only successful scrapes are timed; failures would skew the latency buckets
+        metrics.SCRAPE_SECONDS.labels("financial-report").observe(time.perf_counter() - start)
+        return etag_response(body, "financial-report", cache_key, artifacts)
         
-        if result.get('status') == 'error':
-            return jsonify({
-                "status": "error",
-                "error": result.get('error', 'Unknown error occurred')
-            }), 500
-        
-        # Return success response with parsed data
-        return jsonify({
-            "status": "success",
-            "symbol": result.get('search_term'),
-            "parsed_data": result.get('parsed_data', {}),
-            "screenshot": result.get('screenshot'),
-            "html": result.get('html'),
-            "json": result.get('json'),
-            "timestamp": result.get('timestamp')
-        }), 200
-        
+    except ScrapeQueueFull:
+        return busy_response()
     except Exception as e:
-        return jsonify({
+        return json_response({
             "status": "error",
             "error": str(e)
-        }), 500
+        }, 500)
+
+
+# Static bodies are encoded once at import; liveness probes hit /health often
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "message": "NSE Scraper API is running"
+})
+_INDEX_BODY = orjson.dumps({
+    "name": "NSE Scraper API",
+    "version": "1.0.0",
+    "endpoints": {
+        "GET /api/equity-quote": {
+            "description": "Scrape NSE equity quote data",
+            "required_params": ["symbol", "name (company slug, e.g., Reliance-Industries-Limited)"],
+            "optional_params": ["headless (default=true)", "take_screenshot", "persist", "returns", "output_dir", "nocache"],
+            "example": "/api/equity-quote?symbol=RELIANCE&name=Reliance-Industries-Limited&headless=true"
+        },
+        "GET /api/financial-report": {
+            "description": "Scrape NSE financial results comparison",
+            "required_params": ["symbol"],
+            "optional_params": ["headless (default=true)", "take_screenshot", "persist", "output_dir", "nocache"],
+            "example": "/api/financial-report?symbol=RELIANCE&headless=true"
+        },
+        "GET /health": "Health check endpoint"
+    }
+})
 
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "message": "NSE Scraper API is running"
-    }), 200
+    return app.response_class(_HEALTH_BODY, mimetype='application/json')
 
 
 @app.route('/', methods=['GET'])
 def index():
     """API documentation endpoint"""
-    return jsonify({
-        "name": "NSE Scraper API",
-        "version": "1.0.0",
-        "endpoints": {
-            "GET /api/equity-quote": {
-                "description": "Scrape NSE equity quote data",
-                "required_params": ["symbol", "name (company slug, e.g., Reliance-Industries-Limited)"],
-                "optional_params": ["headless (default=true)", "take_screenshot", "output_dir"],
-                "example": "/api/equity-quote?symbol=RELIANCE&name=Reliance-Industries-Limited&headless=true"
-            },
-            "GET /api/financial-report": {
-                "description": "Scrape NSE financial results comparison",
-                "required_params": ["symbol"],
-                "optional_params": ["headless (default=true)", "output_dir"],
-                "example": "/api/financial-report?symbol=RELIANCE&headless=true"
-            },
-            "GET /health": "Health check endpoint"
-        }
-    }), 200
+    response = app.response_class(_INDEX_BODY, mimetype='application/json')
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=False, host='0.0.0.0', port=5000)
 
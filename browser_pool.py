@@ -0,0 +1,297 @@
+"""
+Shared Playwright browser pool for the API.
+
+One Chromium instance is launched on first use and a fixed number of browser
+contexts are kept open in a queue. Each scrape borrows a context and hands it
+back when done, so requests skip the browser cold start and keep the NSE
+cookies/session picked up by earlier scrapes.
+
+The NSE home page is visited once at launch (and again whenever the cookies
+are older than ``cookie_ttl``) and the resulting cookies are copied into every
+context, so scrapes in pooled contexts can skip their own home-page hop.
+
+Each context also keeps one long-lived page (see ``page_for``) that scrapes
+navigate instead of opening and closing a page per request.
+
+The browser settings and page helpers both scrapers share (launch arguments,
+context options, ``PLAYWRIGHT_WS``, asset blocking, output writers) live here
+too, so the pool and the standalone scrapers cannot drift apart.
+"""
+
+import asyncio
+import os
+import time
+from playwright.async_api import async_playwright
+
+# Page whose visit hands out the session cookies NSE's anti-bot checks expect
+COOKIE_URL = "https://www.nseindia.com"
+
+# ws:// endpoint of a running `playwright launch-server`; when set, standalone
+# scrapes connect to that warm browser instead of launching a new Chromium
+PLAYWRIGHT_WS = os.getenv("PLAYWRIGHT_WS")
+
+# Chromium uses HTTP/2 (multiplexing the page's many small requests) unless NSE_DISABLE_HTTP2=true
+DISABLE_HTTP2 = os.getenv("NSE_DISABLE_HTTP2", "false").lower() == "true"
+
+# Launch/context settings for the pool and the standalone scrapers
+LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--window-size=1920,1080',
+    '--disable-blink-features=AutomationControlled',
+] + (['--disable-http2'] if DISABLE_HTTP2 else [])
+
+# Installed on every scrape page to hide automation flags
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => false});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+"""
+
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "ignore_https_errors": True,
+    "java_script_enabled": True,
+    "reduced_motion": 'no-preference',
+}
+
+# Resource types and hosts the parsers never need; aborting them cuts most of the page weight
+TRACKER_HOSTS = ("googletagmanager", "google-analytics", "doubleclick")
+
+
+async def launch_browser(p, headless: bool, storage_state: str = None):
+    """
+    Launch Chromium and open a browser context with the scrapers' settings.
+
+    With ``PLAYWRIGHT_WS`` set the browser server at that endpoint is used
+    instead (its own headless setting applies); closing the returned browser
+    then only disconnects. ``storage_state`` is an optional saved cookie file.
+    """
+    if PLAYWRIGHT_WS:
+        browser = await p.chromium.connect(PLAYWRIGHT_WS)
+    else:
+        browser = await p.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+    context = await browser.new_context(storage_state=storage_state, **CONTEXT_OPTIONS)
+    return browser, context
+
+
+async def block_assets(page, take_screenshot: bool):
+    """Abort fonts, media, trackers and (unless a screenshot is wanted) images on ``page``."""
+    blocked = {"font", "media"} if take_screenshot else {"image", "font", "media"}
+
+    async def _block(route):
+        request = route.request
+        if request.resource_type in blocked or any(host in request.url for host in TRACKER_HOSTS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", _block)
+    return _block
+
+
+async def unblock_assets(page, handler):
+    """Remove a ``block_assets`` route so a reused page starts clean."""
+    if not page.is_closed():
+        await page.unroute("**/*", handler)
+
+
+def write_text(path: str, text: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_bytes(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+class BrowserPool:
+    """
+    Bounded pool of pre-warmed browser contexts.
+
+    The pool is bound to the event loop it is first used from (Playwright
+    objects cannot be shared across loops). ``acquire`` returns ``None`` when
+    called from any other loop so the caller can fall back to launching its
+    own browser.
+    """
+
+    def __init__(self, size: int, headless: bool = True, cookie_ttl: float = 600):
+        self.size = max(1, size)
+        self.headless = headless
+        self.cookie_ttl = cookie_ttl
+        self.cookies = []
+        self._cookies_at = 0.0
+        self._cookie_gen = 0
+        self._context_gen = {}
+        self._pages = {}
+        self._warm_lock = None
+        self._loop = None
+        self._ready = None
+        self._playwright = None
+        self._browser = None
+        self._contexts = None
+
+    async def _launch(self):
+        print(f"[INFO] Starting browser pool with {self.size} contexts...")
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=LAUNCH_ARGS,
+        )
+        self._contexts = asyncio.Queue()
+        for _ in range(self.size):
+            context = await self._browser.new_context(**CONTEXT_OPTIONS)
+            self._pages[context] = await self._open_page(context)
+            self._contexts.put_nowait(context)
+        self._warm_lock = asyncio.Lock()
+        await self._warm_cookies()
+        print("[SUCCESS] Browser pool ready")
+
+    @staticmethod
+    async def _open_page(context):
+        page = await context.new_page()
+        await page.add_init_script(STEALTH_SCRIPT)
+        return page
+
+    def page_for(self, context):
+        """The long-lived page of a borrowed ``context`` (None if it is not a pooled context)."""
+        return self._pages.get(context)
+
+    async def _warm_cookies(self):
+        """Visit the NSE home page in a scratch context and keep its cookies for the pool."""
+        print("[INFO] Priming NSE cookies for the browser pool...")
+        context = await self._browser.new_context(**CONTEXT_OPTIONS)
+        try:
+            page = await context.new_page()
+            await page.goto(COOKIE_URL, wait_until="domcontentloaded", timeout=60000)
+            self.cookies = await context.cookies()
+            self._cookie_gen += 1
+        except Exception as e:
+            # Keep any older cookies; scrapes prime their own page while there are none
+            print(f"[WARN] Cookie priming failed: {e}")
+        finally:
+            # Failed attempts also wait out the TTL rather than stalling every acquire
+            self._cookies_at = time.monotonic()
+            await context.close()
+
+    def expire_cookies(self):
+        """Mark the shared cookies stale (e.g. after NSE answered 401/403) so the next acquire re-primes."""
+        self._cookies_at = 0.0
+
+    async def _refresh_cookies(self, context):
+        """Re-prime the shared cookies when stale and copy the current set into ``context``."""
+        if time.monotonic() - self._cookies_at > self.cookie_ttl:
+            async with self._warm_lock:
+                if time.monotonic() - self._cookies_at > self.cookie_ttl:
+                    await self._warm_cookies()
+        if self.cookies and self._context_gen.get(context) != self._cookie_gen:
+            await context.add_cookies(self.cookies)
+            self._context_gen[context] = self._cookie_gen
+
+    async def acquire(self):
+        """Borrow a browser context, waiting until one is free."""
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            self._ready = loop.create_task(self._launch())
+        if self._loop is not loop:
+            return None
+
+        ready = self._ready
+        try:
+            # Shielded so one cancelled waiter does not cancel the launch for the rest
+            await asyncio.shield(ready)
+        except Exception:
+            # Let the next request retry the launch instead of failing forever; only
+            # the first waiter resets, so a relaunch started since is left alone
+            if self._ready is ready:
+                await self._reset()
+            raise
+        contexts = self._contexts
+        context = await contexts.get()
+        try:
+            await self._refresh_cookies(context)
+            page = self._pages.get(context)
+            if page is None or page.is_closed():
+                # The previous scrape's page crashed or was closed; replace it
+                self._pages[context] = await self._open_page(context)
+        except Exception as e:
+            print(f"[WARN] Could not prepare pooled context: {e}")
+        except BaseException:
+            # Cancelled (e.g. the request timed out) while preparing: hand the context back
+            contexts.put_nowait(context)
+            raise
+        return context
+
+    async def release(self, context):
+        """Return a borrowed context to the pool."""
+        if context is not None and self._contexts is not None:
+            self._contexts.put_nowait(context)
+
+    async def _reset(self):
+        # Detach the current browser before awaiting anything, so concurrent
+        # callers see the pool as reset and a new launch is never closed here
+        browser, playwright = self._browser, self._playwright
+        self._loop = None
+        self._ready = None
+        self._playwright = None
+        self._browser = None
+        self._contexts = None
+        self.cookies = []
+        self._cookies_at = 0.0
+        self._context_gen = {}
+        self._pages = {}
+        self._warm_lock = None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception:
+                pass
+
+    async def close(self):
+        """Close every context, the browser and the Playwright driver."""
+        if self._ready is None:
+            return
+        print("[INFO] Closing browser pool...")
+        await self._reset()
+
+    def close_sync(self):
+        """Close the pool from a non-async caller (e.g. an ``atexit`` hook)."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        if self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.close(), self._loop).result(timeout=30)
+        else:
+            self._loop.run_until_complete(self.close())
+
+
+__all__ = [
+    "BrowserPool",
+    "COOKIE_URL",
+    "PLAYWRIGHT_WS",
+    "DISABLE_HTTP2",
+    "LAUNCH_ARGS",
+    "CONTEXT_OPTIONS",
+    "STEALTH_SCRIPT",
+    "TRACKER_HOSTS",
+    "launch_browser",
+    "block_assets",
+    "unblock_assets",
+    "write_text",
+    "write_bytes",
+]
@@ -0,0 +1,112 @@
+"""
+TTL caches for API responses.
+
+Each entry is stored as ``<root>/<endpoint>/<key>.json`` holding
+``{"ts": <unix time written>, "payload": <response body>}``; an entry is fresh
+while it is younger than the TTL the caller asks for.
+
+``RedisCache`` keeps the same entries in Redis so every worker and pod shares
+them, with a ``FileCache`` behind it for misses and Redis outages.
+"""
+
+import hashlib
+import math
+import os
+import tempfile
+import time
+import orjson
+
+
+def make_key(*parts) -> str:
+    """Build a cache key from request parameters."""
+    return hashlib.md5("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def _encode(payload) -> bytes:
+    """Serialise a cache entry for ``payload`` stamped with the current time."""
+    return orjson.dumps({"ts": time.time(), "payload": payload}, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FileCache:
+    """JSON file cache keyed by endpoint name and request key."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, endpoint: str, key: str) -> str:
+        return os.path.join(self.root, endpoint, f"{key}.json")
+
+    def get(self, endpoint: str, key: str, ttl: float):
+        """Return the cached payload, or None when missing or older than ``ttl`` seconds."""
+        try:
+            with open(self._path(endpoint, key), "rb") as f:
+                entry = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("ts", 0) > ttl:
+            return None
+        return entry.get("payload")
+
+    def set(self, endpoint: str, key: str, payload, ttl: float = None) -> None:
+        """
+        Store ``payload``; written to a temp file and renamed so readers never see partial JSON.
+
+        ``ttl`` is accepted for interface parity with RedisCache; freshness is checked on read.
+        """
+        path = self._path(endpoint, key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_encode(payload))
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+class RedisCache:
+    """Redis cache shared across processes, falling back to ``fallback`` on a miss or Redis error."""
+
+    def __init__(self, url: str, fallback: FileCache, prefix: str = "nse-cache"):
+        import redis
+
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._errors = redis.RedisError
+        self.fallback = fallback
+        self.prefix = prefix
+
+    def _name(self, endpoint: str, key: str) -> str:
+        return f"{self.prefix}:{endpoint}:{key}"
+
+    def get(self, endpoint: str, key: str, ttl: float):
+        """Return the cached payload, or None when missing or older than ``ttl`` seconds."""
+        try:
+            raw = self._redis.get(self._name(endpoint, key))
+        except self._errors:
+            raw = None
+        if raw is None:
+            return self.fallback.get(endpoint, key, ttl)
+        try:
+            entry = orjson.loads(raw)
+        except ValueError:
+            return None
+        if time.time() - entry.get("ts", 0) > ttl:
+            return None
+        return entry.get("payload")
+
+    def set(self, endpoint: str, key: str, payload, ttl: float = None) -> None:
+        """Store ``payload`` in Redis (expiring after ``ttl`` seconds) and in the fallback cache."""
+        self.fallback.set(endpoint, key, payload, ttl)
+        entry = _encode(payload)
+        try:
+            self._redis.set(self._name(endpoint, key), entry, ex=math.ceil(ttl) if ttl else None)
+        except self._errors as e:
+            print(f"[WARN] Redis cache write failed: {e}")
+
+
+__all__ = ["FileCache", "RedisCache", "make_key"]
@@ -4,6 +4,9 @@ One-shot runner to scrape an NSE equity quote page with human-like behavior.
 Edit the URL/OUTPUT_DIR/HEADLESS/TAKE_SCREENSHOT constants below and run:
     python equity_quote_run.py
 
+For many symbols, ``scrape_many(urls, concurrency=8)`` scrapes them in
+parallel pages of one browser.
+
 Outputs:
     - Screenshot (optional)
     - Rendered HTML
@@ -11,19 +14,43 @@ Outputs:
 """
 
 import asyncio
+import copy
+import hashlib
 import os
 import random
 import json
 import re
+import orjson
+import urllib.parse
+from collections import OrderedDict
 from datetime import datetime
 from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
+import nse_http
+from browser_pool import (
+    CONTEXT_OPTIONS,
+    LAUNCH_ARGS,
+    PLAYWRIGHT_WS,
+    STEALTH_SCRIPT,
+    block_assets,
+    launch_browser,
+    unblock_assets,
+    write_bytes,
+    write_text,
+)
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # BeautifulSoup fallback in parse_nse_quote_html
+    HTMLParser = None
 
 # --------- CONFIG ---------
 URL = "https://www.nseindia.com/get-quote/equity/RELIANCE/Reliance-Industries-Limited"
 OUTPUT_DIR = "output"
 HEADLESS = False           # Set True to hide browser
 TAKE_SCREENSHOT = True     # Set False to skip screenshot
+# Chromium profile reused across runs; kept under the git-ignored .cache/
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "pw_profile")
 # ---------------------------
 
 
@@ -32,200 +59,204 @@ async def human_delay(min_sec: float = 0.5, max_sec: float = 2.0):
     await asyncio.sleep(random.uniform(min_sec, max_sec))
 
 
+# Label prefixes of the OHLC/VWAP "symbol-item" divs, each followed directly by its value
+_LABEL_RES = {
+    label: re.compile(re.escape(label) + r'([0-9,.\-]+)')
+    for label in ('Prev. Close', 'Open', 'High', 'Low', 'VWAP', 'Close')
+}
+
+# (data key, label, value, trailer) for fields read from the main body text, in output order
+_FIELD_PATTERNS = (
+    ('traded_volume_lakhs', r'Traded Volume \(Lakhs\)', r'[0-9,.]+', ''),
+    ('traded_value_cr', r'Traded Value \(₹ Cr\.\)', r'[0-9,.]+', ''),
+    ('total_market_cap_cr', r'Total Market Cap \(₹ Cr\.\)', r'[0-9,.]+', ''),
+    ('free_float_market_cap_cr', r'Free Float Market Cap \(₹ Cr\.\)', r'[0-9,.]+', ''),
+    ('impact_cost', r'Impact cost', r'[0-9,.]+', ''),
+    ('face_value', r'Face Value', r'[0-9,.]+', ''),
+    ('52_week_high', r'52 Week High \([^)]+\)', r'[0-9,.]+', ''),
+    ('52_week_low', r'52 Week Low \([^)]+\)', r'[0-9,.]+', ''),
+    ('upper_band', r'Upper Band', r'[0-9,.]+', ''),
+    ('lower_band', r'Lower Band', r'[0-9,.]+', ''),
+    ('delivery_qty_pct', r'Deliverable / Traded Quantity', r'[0-9,.]+%', ''),
+    ('daily_volatility', r'Daily Volatility', r'[0-9,.]+', ''),
+    ('annualised_volatility', r'Annualised Volatility', r'[0-9,.]+', ''),
+    ('pe', r'Symbol P/E', r'[0-9,.]+', ''),
+    ('adjusted_pe', r'Adjusted P/E', r'[0-9,.]+', ''),
+    ('isin', r'\(', r'[A-Z]{2}[A-Z0-9]{10}', r'\)'),
+    ('listing_date', r'Date of Listing', r'[0-9]{2}-[A-Za-z]{3}-[0-9]{4}', ''),
+    ('industry', r'Basic Industry', r'[A-Za-z &]+', 'Dashboard'),
+    ('total_buy_qty', r'Total Buy Quantity', r'[0-9,.]+', ''),
+    ('total_sell_qty', r'Total Sell Quantity', r'[0-9,.]+', ''),
+)
+
+
+def _field_alternative(i, label, value, trailer):
+    """Regex for one body-text field: the label's first character, then the rest as a lookahead."""
+    head = re.match(r'\\?.', label).group()
+    return f'{head}(?={label[len(head):]}(?P<v{i}>{value}){trailer})'
+
+
+# All body-text fields as one alternation, so the text is scanned once; the
+# value of field i is captured in group "v<i>". Only one character is consumed
+# per match so fields can overlap, as in "52 Week High (..)1,581.3052 Week Low",
+# while re can still skip straight to the labels' first characters
+_FIELDS_RE = re.compile('|'.join(
+    _field_alternative(i, label, value, trailer)
+    for i, (_, label, value, trailer) in enumerate(_FIELD_PATTERNS)
+))
+
+# Return periods shown as e.g. "YTD26.26%", "1M3.54%" or "1Y -12.30%"
+_RETURNS_RE = re.compile(
+    r'(?P<period>YTD|1M|3M|6M|1Y|3Y|5Y|10Y|15Y|20Y|25Y|30Y)\s*(?P<pct>-?[0-9.]+%)'
+)
+
+# Host part of a URL, used to name output files
+_DOMAIN_RE = re.compile(r'(?:[a-z]+://)?([^/]*)')
+
+# Symbol part of a quote URL: /get-quote/equity/{SYMBOL}/{COMPANY-SLUG}
+_QUOTE_URL_RE = re.compile(r'/get-quote/equity/([^/?#]+)')
+
+# symbol-item label prefixes and the data key each fills
+_SYMBOL_ITEM_KEYS = {
+    'Prev. Close': 'prev_close',
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'VWAP': 'vwap',
+    'Close': 'close',
+}
+
+# One anchored match per symbol-item: which label it starts with, and the value right after it
+_SYMBOL_ITEM_RE = re.compile(
+    '(' + '|'.join(re.escape(label) for label in _SYMBOL_ITEM_KEYS) + r')([0-9,.\-]+)?'
+)
+
+
 def extract_value_after_label(text: str, label: str) -> str:
     """
     Extract numeric value that appears immediately after a label in text.
     Example: "Open1,534.00" with label "Open" returns "1,534.00"
     """
-    pattern = label + r'([0-9,.\-]+)'
-    match = re.search(pattern, text)
+    pattern = _LABEL_RES.get(label) or re.compile(re.escape(label) + r'([0-9,.\-]+)')
+    match = pattern.search(text)
     if match:
         return match.group(1)
     return None
 
 
+def _main_body_html(html_content: str) -> str:
+    """
+    Cut the ``<main id="midBody">`` element out of the page so the HTML parser
+    skips the header, footer and scripts around it (about a third of the page);
+    every element the quote parser reads lives inside it.
+    """
+    marker = html_content.find('id="midBody"')
+    start = html_content.rfind('<main', 0, marker) if marker >= 0 else -1
+    end = html_content.find('</main>', marker) if start >= 0 else -1
+    if end < 0:
+        return html_content
+    return html_content[start:end + len('</main>')]
+
+
+def _quote_parts_lexbor(html_content: str):
+    """Pull the text pieces the quote parser needs using selectolax's lexbor (C) HTML parser."""
+    tree = HTMLParser(html_content)
+    main_body = tree.css_first('main#midBody')
+    if main_body is None:
+        return None
+    
+    def joined(nodes):
+        return ''.join(node.text(strip=True) for node in nodes).strip()
+    
+    symbol_elem = tree.css_first('span.symbol-text')
+    ltp_div = tree.css_first('div.index-highlight')
+    return {
+        'body_text': main_body.text(),
+        'symbol': symbol_elem.text(strip=True) if symbol_elem is not None else None,
+        # The price is split into one span per digit; the container's text is their concatenation
+        'last_price': ltp_div.text(strip=True) if ltp_div is not None else None,
+        'changes': [joined(div.css('span')) for div in tree.css('div.index-change-highlight')],
+        'symbol_items': [item.text(strip=True) for item in tree.css('div.symbol-item')],
+    }
+
+
+def _quote_parts_soup(html_content: str):
+    """BeautifulSoup equivalent of ``_quote_parts_lexbor`` for installs without selectolax."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    main_body = soup.find('main', id='midBody')
+    if not main_body:
+        return None
+    
+    def joined(nodes):
+        return ''.join(node.get_text(strip=True) for node in nodes).strip()
+    
+    symbol_elem = soup.find('span', class_='symbol-text')
+    ltp_div = soup.find('div', class_='index-highlight')
+    return {
+        'body_text': main_body.get_text(),
+        'symbol': symbol_elem.get_text(strip=True) if symbol_elem else None,
+        'last_price': ''.join(ltp_div.stripped_strings) if ltp_div else None,
+        'changes': [joined(div.find_all('span')) for div in soup.find_all('div', class_='index-change-highlight')],
+        'symbol_items': [item.get_text(strip=True) for item in soup.find_all('div', class_='symbol-item')],
+    }
+
+
 def parse_nse_quote_html(html_content: str) -> dict:
     """
     Parse the rendered NSE equity quote HTML and extract all data.
     
     NSE stores data in specific div structures with continuous text
-    (no spaces between labels and values).
+    (no spaces between labels and values). The HTML is parsed with
+    selectolax when installed, otherwise with BeautifulSoup.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
     data = {}
     
     try:
-        # Get main body text for pattern matching
-        main_body = soup.find('main', id='midBody')
-        if not main_body:
+        main_html = _main_body_html(html_content)
+        parts = _quote_parts_lexbor(main_html) if HTMLParser else _quote_parts_soup(main_html)
+        if parts is None:
             return {"error": "Main body not found"}
         
-        body_text = main_body.get_text()
+        # Main body text for pattern matching
+        body_text = parts['body_text']
         
-        # Extract symbol from header
-        symbol_elem = soup.find('span', class_='symbol-text')
-        if symbol_elem:
-            data['symbol'] = symbol_elem.get_text(strip=True)
+        # Symbol from header
+        if parts['symbol'] is not None:
+            data['symbol'] = parts['symbol']
         
-        # Extract current price from index-highlight
-        ltp_div = soup.find('div', class_='index-highlight')
-        if ltp_div:
-            spans = ltp_div.find_all('span', class_='value')
-            if not spans:
-                spans = ltp_div.find_all('span')
-            price_text = ''.join([span.get_text(strip=True) for span in spans])
-            data['last_price'] = price_text.strip()
+        # Current price from index-highlight
+        if parts['last_price'] is not None:
+            data['last_price'] = parts['last_price']
         
-        # Extract change and percent change
-        change_divs = soup.find_all('div', class_='index-change-highlight')
-        if len(change_divs) >= 2:
-            change_spans = change_divs[0].find_all('span')
-            pct_spans = change_divs[1].find_all('span')
-            data['change'] = ''.join([s.get_text(strip=True) for s in change_spans]).strip()
-            data['percent_change'] = ''.join([s.get_text(strip=True) for s in pct_spans]).strip()
+        # Change and percent change
+        if len(parts['changes']) >= 2:
+            data['change'] = parts['changes'][0]
+            data['percent_change'] = parts['changes'][1]
         
         # Extract OHLC and VWAP from symbol-item divs
-        symbol_items = soup.find_all('div', class_='symbol-item')
-        for item in symbol_items:
-            text = item.get_text(strip=True)
-            
-            if text.startswith('Prev. Close'):
-                data['prev_close'] = extract_value_after_label(text, 'Prev. Close')
-            elif text.startswith('Open'):
-                data['open'] = extract_value_after_label(text, 'Open')
-            elif text.startswith('High'):
-                data['high'] = extract_value_after_label(text, 'High')
-            elif text.startswith('Low'):
-                data['low'] = extract_value_after_label(text, 'Low')
-            elif text.startswith('VWAP'):
-                data['vwap'] = extract_value_after_label(text, 'VWAP')
-            elif text.startswith('Close'):
-                close_val = extract_value_after_label(text, 'Close')
-                if close_val and close_val != '-':
-                    data['close'] = close_val
-        
-        # Extract volume and value from body text
-        vol_match = re.search(r'Traded Volume \(Lakhs\)([0-9,.]+)', body_text)
-        if vol_match:
-            data['traded_volume_lakhs'] = vol_match.group(1)
-        
-        val_match = re.search(r'Traded Value \(₹ Cr\.\)([0-9,.]+)', body_text)
-        if val_match:
-            data['traded_value_cr'] = val_match.group(1)
-        
-        # Extract market cap
-        mcap_match = re.search(r'Total Market Cap \(₹ Cr\.\)([0-9,.]+)', body_text)
-        if mcap_match:
-            data['total_market_cap_cr'] = mcap_match.group(1)
-        
-        ffmc_match = re.search(r'Free Float Market Cap \(₹ Cr\.\)([0-9,.]+)', body_text)
-        if ffmc_match:
-            data['free_float_market_cap_cr'] = ffmc_match.group(1)
-        
-        # Extract impact cost and face value
-        impact_match = re.search(r'Impact cost([0-9,.]+)', body_text)
-        if impact_match:
-            data['impact_cost'] = impact_match.group(1)
-        
-        fv_match = re.search(r'Face Value([0-9,.]+)', body_text)
-        if fv_match:
-            data['face_value'] = fv_match.group(1)
-        
-        # Extract 52-week high and low
-        high52_match = re.search(r'52 Week High \([^)]+\)([0-9,.]+)', body_text)
-        if high52_match:
-            data['52_week_high'] = high52_match.group(1)
-        
-        low52_match = re.search(r'52 Week Low \([^)]+\)([0-9,.]+)', body_text)
-        if low52_match:
-            data['52_week_low'] = low52_match.group(1)
-        
-        # Extract upper and lower bands
-        upper_match = re.search(r'Upper Band([0-9,.]+)', body_text)
-        if upper_match:
-            data['upper_band'] = upper_match.group(1)
-        
-        lower_match = re.search(r'Lower Band([0-9,.]+)', body_text)
-        if lower_match:
-            data['lower_band'] = lower_match.group(1)
-        
-        # Extract delivery data
-        del_qty_match = re.search(r'Deliverable / Traded Quantity([0-9,.]+)%', body_text)
-        if del_qty_match:
-            data['delivery_qty_pct'] = del_qty_match.group(1) + '%'
-        
-        # Extract volatility
-        daily_vol_match = re.search(r'Daily Volatility([0-9,.]+)', body_text)
-        if daily_vol_match:
-            data['daily_volatility'] = daily_vol_match.group(1)
-        
-        annual_vol_match = re.search(r'Annualised Volatility([0-9,.]+)', body_text)
-        if annual_vol_match:
-            data['annualised_volatility'] = annual_vol_match.group(1)
-        
-        # Extract P/E and other ratios
-        pe_match = re.search(r'Symbol P/E([0-9,.]+)', body_text)
-        if pe_match:
-            data['pe'] = pe_match.group(1)
-        
-        adj_pe_match = re.search(r'Adjusted P/E([0-9,.]+)', body_text)
-        if adj_pe_match:
-            data['adjusted_pe'] = adj_pe_match.group(1)
-        
-        # Extract security info
-        isin_match = re.search(r'\(([A-Z]{2}[A-Z0-9]{10})\)', body_text)
-        if isin_match:
-            data['isin'] = isin_match.group(1)
-        
-        listing_match = re.search(r'Date of Listing([0-9]{2}-[A-Za-z]{3}-[0-9]{4})', body_text)
-        if listing_match:
-            data['listing_date'] = listing_match.group(1)
-        
-        # Extract industry
-        industry_match = re.search(r'Basic Industry([A-Za-z &]+)Dashboard', body_text)
-        if industry_match:
-            data['industry'] = industry_match.group(1).strip()
-        
-        # Extract order book data (Total Buy/Sell Quantity)
-        order_data = soup.find('div', class_='OrderData')
-        if order_data:
-            order_text = order_data.get_text()
-            # The order book shows individual bids/asks, not total quantities
-            # We need to find total buy/sell elsewhere
+        for text in parts['symbol_items']:
+            match = _SYMBOL_ITEM_RE.match(text)
+            if match:
+                key, value = _SYMBOL_ITEM_KEYS[match.group(1)], match.group(2)
+                # Close is only shown once the market has closed
+                if key != 'close' or (value and value != '-'):
+                    data[key] = value
         
-        # Look for buy/sell quantities in the main text
-        buy_qty_match = re.search(r'Total Buy Quantity([0-9,.]+)', body_text)
-        if buy_qty_match:
-            data['total_buy_qty'] = buy_qty_match.group(1)
+        # Extract volume/value, market cap, bands, delivery, volatility, ratios,
+        # security info, industry and total buy/sell quantity from the body text
+        found = {}
+        for match in _FIELDS_RE.finditer(body_text):
+            # Keep the first occurrence of each field, like a per-field search would
+            found.setdefault(int(match.lastgroup[1:]), match.group(match.lastgroup))
+        for i, (key, _, _, _) in enumerate(_FIELD_PATTERNS):
+            if i in found:
+                data[key] = found[i].strip()
         
-        sell_qty_match = re.search(r'Total Sell Quantity([0-9,.]+)', body_text)
-        if sell_qty_match:
-            data['total_sell_qty'] = sell_qty_match.group(1)
-        
-        # Extract returns data (YTD, 1M, 3M, 6M, 1Y, 3Y, 5Y)
-        # These are typically shown as percentages in specific sections
+        # Extract returns data (YTD, 1M, 3M, 6M, 1Y, 3Y, 5Y, ...) from the body text,
+        # keeping the first figure for each period like the fields above
         data['returns'] = {}
-        
-        # Find all text elements containing percentages
-        percent_texts = soup.find_all(string=lambda t: t and '%' in t and len(t.strip()) < 50)
-        
-        for text in percent_texts:
-            text_stripped = text.strip()
-            parent = text.find_parent()
-            if not parent or parent.name in ['style', 'script']:
-                continue
-            
-            # Get the context around this percentage
-            parent_text = parent.get_text(strip=True)
-            
-            # Look for return period indicators
-            # Patterns like "YTD26.26%" or "1M3.54%"
-            for period in ['YTD', '1M', '3M', '6M', '1Y', '3Y', '5Y', '10Y', '15Y', '20Y', '25Y', '30Y']:
-                if period in parent_text:
-                    # Extract the percentage near this period
-                    period_match = re.search(period + r'\s*([0-9.]+%)', parent_text)
-                    if period_match:
-                        data['returns'][period] = period_match.group(1)
+        for match in _RETURNS_RE.finditer(body_text):
+            data['returns'].setdefault(match.group('period'), match.group('pct'))
         
     except Exception as e:
         data['parse_error'] = str(e)
@@ -233,132 +264,186 @@ def parse_nse_quote_html(html_content: str) -> dict:
     return data
 
 
-async def scrape_equity_quote(
-    url: str,
-    output_dir: str = "output",
-    headless: bool = False,
-    take_screenshot: bool = True,
-) -> dict:
-    """Scrape the NSE equity quote page; save screenshot, HTML, and extract data."""
-    os.makedirs(output_dir, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    domain = url.split("//")[-1].split("/")[0].replace(".", "_")
-    screenshot_path = os.path.join(output_dir, f"{domain}_quote_{timestamp}.png")
-    html_path = os.path.join(output_dir, f"{domain}_quote_{timestamp}.html")
-    json_path = os.path.join(output_dir, f"{domain}_quote_{timestamp}.json")
+# Browser-like headers sent with every page request
+PAGE_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+}
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=headless,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage', 
-                '--disable-gpu',
-                '--disable-extensions',
-                '--disable-background-timer-throttling',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-renderer-backgrounding',
-                '--window-size=1920,1080',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-http2'
-            ],
-        )
 
-        context = await browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            ignore_https_errors=True,
-            java_script_enabled=True,
-            reduced_motion='no-preference'
-        )
+# Parsed results of recently seen pages, keyed on a digest of the rendered HTML
+_PARSE_CACHE = OrderedDict()
+PARSE_CACHE_SIZE = 256
 
-        page = await context.new_page()
 
-        # Hide automation flags
-        await page.add_init_script(
-            """
-            Object.defineProperty(navigator, 'webdriver', {get: () => false});
-            Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
-            """
-        )
+def parse_nse_quote_html_cached(html_content: str) -> dict:
+    """
+    ``parse_nse_quote_html`` memoised in memory on a hash of the HTML.
 
-        # Extra headers
-        await page.set_extra_http_headers(
-            {
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-                "Cache-Control": "no-cache",
-                "Pragma": "no-cache",
-            }
-        )
+    There is no disk tier: rendered pages carry timestamps, so the same HTML
+    practically never comes back after a restart.
+    """
+    digest = hashlib.blake2b(html_content.encode(), digest_size=16).hexdigest()
+    data = _PARSE_CACHE.get(digest)
+    if data is None:
+        data = parse_nse_quote_html(html_content)
+    _PARSE_CACHE[digest] = data
+    _PARSE_CACHE.move_to_end(digest)
+    if len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+        _PARSE_CACHE.popitem(last=False)
+    # Callers get their own copy so the cached entry cannot be modified
+    return copy.deepcopy(data)
 
-        try:
-            # Prime cookies by visiting NSE homepage first (helps avoid HTTP/2 errors)
-            print("[INFO] Priming cookies via NSE homepage...")
-            try:
-                await page.goto("https://www.nseindia.com", wait_until="domcontentloaded", timeout=60000)
-                await human_delay(1, 2)
-            except Exception as e:
-                print(f"[WARN] Homepage priming failed (continuing anyway): {e}")
-            
-            print(f"[INFO] Opening page: {url}")
-            # Navigate to the target page with retry logic
-            max_retries = 3
-            final_url = url
-            for attempt in range(max_retries):
-                try:
-                    response = await page.goto(
-                        url,
-                        wait_until="networkidle",
-                        timeout=90000,  # 90s max
-                        referer="https://www.nseindia.com"
-                    )
-                    # Get the final URL after any redirects
-                    final_url = page.url
-                    if final_url != url:
-                        print(f"[INFO] Redirected to: {final_url}")
-                    # Wait for main content selectors
-                    await page.wait_for_selector('main#midBody, div#resultsCompare', timeout=30000)
-                    # Trigger lazy load by scrolling
-                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await page.wait_for_timeout(5000)  # Stabilize
-                    break
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        print(f"[WARN] Attempt {attempt + 1} failed, retrying...: {e}")
-                        await human_delay(2, 4)
-                    else:
-                        raise
 
-            print("[INFO] Waiting for page to settle...")
-            await human_delay(3, 5)  # slightly longer for headless
+async def _new_page(context):
+    """Open a page in ``context`` with automation flags hidden and browser headers set."""
+    page = await context.new_page()
 
-            # Wait for main content to load
+    # Hide automation flags
+    await page.add_init_script(STEALTH_SCRIPT)
+
+    # Extra headers
+    await page.set_extra_http_headers(PAGE_HEADERS)
+    return page
+
+
+def _screenshot_ext(screenshot_format: str) -> str:
+    return "jpg" if screenshot_format == "jpeg" else screenshot_format
+
+
+def _screenshot_options(path: str, screenshot_format: str, full_page: bool) -> dict:
+    """``page.screenshot`` arguments; JPEG encodes several times faster than PNG."""
+    options = {"path": path, "type": screenshot_format, "full_page": full_page}
+    if screenshot_format == "jpeg":
+        options["quality"] = 70
+    return options
+
+
+async def _prime_cookies(page):
+    """Visit the NSE homepage so ``page`` picks up session cookies (helps avoid HTTP/2 errors)."""
+    print("[INFO] Priming cookies via NSE homepage...")
+    try:
+        await page.goto("https://www.nseindia.com", wait_until="domcontentloaded", timeout=60000)
+        await human_delay(1, 2)
+    except Exception as e:
+        print(f"[WARN] Homepage priming failed (continuing anyway): {e}")
+
+
+def _output_paths(output_dir: str, url: str, timestamp: str, file_suffix: str, screenshot_format: str):
+    """Screenshot, HTML and JSON paths for one scrape of ``url``."""
+    domain = _DOMAIN_RE.match(url).group(1).replace(".", "_")
+    base = os.path.join(output_dir, f"{domain}_quote_{timestamp}{file_suffix}")
+    return f"{base}.{_screenshot_ext(screenshot_format)}", f"{base}.html", f"{base}.json"
+
+
+async def _scrape_quote_page(
+    page,
+    url: str,
+    output_dir: str,
+    take_screenshot: bool,
+    persist: bool,
+    prime_cookies: bool = True,
+    file_suffix: str = "",
+    headless: bool = False,
+    screenshot_format: str = "jpeg",
+    screenshot_full_page: bool = False,
+    timestamp: str = None,
+) -> dict:
+    """
+    Run the quote scrape on an already prepared ``page``.
+
+    ``file_suffix`` is appended to output file names so concurrent scrapes
+    started in the same second do not overwrite each other's files; a batch
+    can pass one ``timestamp`` for all of its scrapes. Headless runs wait for
+    the quote data to render instead of sleeping human-like delays.
+    """
+    if take_screenshot or persist:
+        os.makedirs(output_dir, exist_ok=True)
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    screenshot_path, html_path, json_path = _output_paths(
+        output_dir, url, timestamp, file_suffix, screenshot_format
+    )
+
+    cookies_expired = False
+    route_handler = await block_assets(page, take_screenshot)
+    try:
+        # Skipped when the context already carries cookies (e.g. from the browser pool)
+        if prime_cookies:
+            await _prime_cookies(page)
+        
+        print(f"[INFO] Opening page: {url}")
+        # Navigate to the target page with retry logic
+        max_retries = 3
+        final_url = url
+        for attempt in range(max_retries):
             try:
-                # Wait for the main body or key elements to appear
-                await page.wait_for_selector('main#midBody', timeout=20000)
-                print("[INFO] Main content loaded")
+                response = await page.goto(
+                    url,
+                    wait_until="networkidle",
+                    timeout=90000,  # 90s max
+                    referer="https://www.nseindia.com"
+                )
+                if response is not None and response.status in (401, 403) and not cookies_expired:
+                    # Borrowed cookies went stale: prime this page and retry
+                    cookies_expired = True
+                    await _prime_cookies(page)
+                    raise RuntimeError(f"HTTP {response.status} with shared cookies")
+                # Get the final URL after any redirects
+                final_url = page.url
+                if final_url != url:
+                    print(f"[INFO] Redirected to: {final_url}")
+                # Wait for main content selectors; the quote data itself is awaited below
+                await page.wait_for_selector('main#midBody, div#resultsCompare', timeout=30000)
+                break
             except Exception as e:
-                print(f"[WARN] Main content selector not found (continuing anyway): {e}")
+                if attempt < max_retries - 1:
+                    print(f"[WARN] Attempt {attempt + 1} failed, retrying...: {e}")
+                    await human_delay(2, 4)
+                else:
+                    raise
 
-            # Move mouse to simulate activity
-            await page.mouse.move(random.randint(200, 600), random.randint(200, 600))
+        print("[INFO] Waiting for page to settle...")
+        if not headless:
+            await human_delay(3, 5)
+
+        # Wait for main content to load
+        try:
+            # Wait for the main body or key elements to appear
+            await page.wait_for_selector('main#midBody', timeout=20000)
+            print("[INFO] Main content loaded")
+        except Exception as e:
+            print(f"[WARN] Main content selector not found (continuing anyway): {e}")
+
+        # Move mouse to simulate activity
+        await page.mouse.move(random.randint(200, 600), random.randint(200, 600))
+        if not headless:
             await human_delay(0.5, 1.0)
 
-            # Scroll a bit
-            await page.mouse.wheel(0, random.randint(200, 600))
+        # Scroll a bit
+        await page.mouse.wheel(0, random.randint(200, 600))
+
+        if headless:
+            # Resolve as soon as the price block has rendered and requests have settled
+            try:
+                await page.wait_for_function(
+                    "() => [...document.querySelectorAll('div.symbol-item')]"
+                    ".some(el => el.innerText.includes('VWAP'))",
+                    timeout=20000
+                )
+                await page.wait_for_load_state('networkidle', timeout=15000)
+            except Exception as e:
+                print(f"[WARN] Quote data wait timed out (continuing anyway): {e}")
+        else:
             await human_delay(0.5, 1.0)
 
             # Extra wait for dynamic content to fully load
@@ -367,57 +452,224 @@ async def scrape_equity_quote(
             # Additional wait for any lazy-loaded content
             await human_delay(2, 4)
 
-            if take_screenshot:
-                print("[INFO] Taking screenshot...")
-                await page.screenshot(path=screenshot_path, full_page=True)
-                print(f"[SUCCESS] Screenshot saved: {screenshot_path}")
-
+        # The screenshot (encoded by the browser) and the file writes (on worker
+        # threads) run alongside fetching and parsing the HTML
+        pending = []
+        if take_screenshot:
+            print("[INFO] Taking screenshot...")
+            pending.append(asyncio.create_task(
+                page.screenshot(**_screenshot_options(screenshot_path, screenshot_format, screenshot_full_page))
+            ))
+
+        html_content = await page.content()
+        if persist:
             print("[INFO] Saving HTML content...")
-            html_content = await page.content()
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(html_content)
-            print(f"[SUCCESS] HTML saved: {html_path}")
+            pending.append(asyncio.create_task(asyncio.to_thread(write_text, html_path, html_content)))
 
-            print("[INFO] Parsing HTML to extract data...")
-            parsed_data = parse_nse_quote_html(html_content)
-            
-            # Debug: Check if data was extracted
-            if not parsed_data or len(parsed_data) <= 1:
-                print(f"[WARN] Limited data extracted. Keys found: {list(parsed_data.keys())}")
-                # Check if main body exists in HTML
-                if 'main#midBody' in html_content or 'id="midBody"' in html_content:
-                    print("[INFO] Main body found in HTML")
-                else:
-                    print("[WARN] Main body NOT found in HTML - page may not have loaded correctly")
-            
-            # Save parsed JSON
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(parsed_data, f, indent=2, ensure_ascii=False)
+        print("[INFO] Parsing HTML to extract data...")
+        parsed_data = parse_nse_quote_html_cached(html_content)
+        
+        # Debug: Check if data was extracted
+        if not parsed_data or len(parsed_data) <= 1:
+            print(f"[WARN] Limited data extracted. Keys found: {list(parsed_data.keys())}")
+            # Check if main body exists in HTML
+            if 'main#midBody' in html_content or 'id="midBody"' in html_content:
+                print("[INFO] Main body found in HTML")
+            else:
+                print("[WARN] Main body NOT found in HTML - page may not have loaded correctly")
+        
+        # Save parsed JSON
+        if persist:
+            pending.append(asyncio.create_task(asyncio.to_thread(
+                write_bytes, json_path,
+                orjson.dumps(parsed_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )))
+
+        await asyncio.gather(*pending)
+        if take_screenshot:
+            print(f"[SUCCESS] Screenshot saved: {screenshot_path}")
+        if persist:
+            print(f"[SUCCESS] HTML saved: {html_path}")
             print(f"[SUCCESS] Parsed JSON saved: {json_path}")
 
+        return {
+            "status": "success",
+            "url": final_url,  # Return final URL after redirects
+            "original_url": url,
+            "screenshot": screenshot_path if take_screenshot else None,
+            "html": html_path if persist else None,
+            "json": json_path if persist else None,
+            "data": parsed_data,
+            "timestamp": timestamp,
+            "cookies_expired": cookies_expired,
+        }
+
+    except Exception as e:
+        print(f"[ERROR] Failed to scrape: {e}")
+        return {
+            "status": "error",
+            "url": url,
+            "error": str(e),
+            "cookies_expired": cookies_expired,
+        }
+    finally:
+        await unblock_assets(page, route_handler)
+
+
+async def scrape_equity_quote(
+    url: str,
+    output_dir: str = "output",
+    headless: bool = False,
+    take_screenshot: bool = True,
+    context=None,
+    persist: bool = False,
+    prime_cookies: bool = True,
+    page=None,
+    try_http: bool = True,
+    screenshot_format: str = "jpeg",
+    screenshot_full_page: bool = False,
+    user_data_dir: str = None,
+) -> dict:
+    """
+    Scrape the NSE equity quote page and extract data.
+
+    Unless a screenshot or saved HTML is wanted (or ``try_http`` is off), the
+    quote is first fetched from NSE's JSON API over plain HTTP (see
+    ``nse_http``); the browser is only used when that fails. Such quotes have
+    no ``returns`` or ``adjusted_pe``; pass ``try_http=False`` when those are needed.
+
+    The screenshot is only taken when ``take_screenshot`` is set (a JPEG of the
+    viewport by default; pass ``screenshot_format="png"`` and/or
+    ``screenshot_full_page=True`` for the old full-page PNG), and the
+    rendered HTML and parsed JSON are only written to ``output_dir`` when
+    ``persist`` is set; otherwise everything stays in memory.
+
+    When an existing browser ``context`` is given (e.g. from the API's browser
+    pool) the scrape runs in a new page of it and the context is left open;
+    otherwise a fresh Chromium is launched and closed for this call. Pass
+    ``prime_cookies=False`` when that context already holds NSE cookies to skip
+    the homepage visit; ``cookies_expired`` in the result reports that NSE
+    rejected them and the page had to prime its own.
+
+    A long-lived ``page`` (e.g. the one the browser pool keeps per context) is
+    reused as-is, with only this scraper's headers applied, and left open.
+
+    With ``user_data_dir`` the launched browser uses a persistent Chromium
+    profile in that directory, so NSE cookies and cached assets carry over to
+    the next run and the homepage visit is skipped while cookies are saved.
+    A profile can only be open in one browser at a time. When connected to a
+    Playwright server (``PLAYWRIGHT_WS``) only the cookies are kept, in
+    ``storage_state.json`` inside that directory.
+    """
+    symbol = _QUOTE_URL_RE.search(url)
+    if try_http and not take_screenshot and not persist and symbol:
+        try:
+            return await nse_http.fetch_quote(urllib.parse.unquote(symbol.group(1)), url)
+        except nse_http.FallbackNeeded as e:
+            print(f"[WARN] HTTP fast path failed, falling back to browser: {e}")
+
+    if page is not None:
+        await page.set_extra_http_headers(PAGE_HEADERS)
+        return await _scrape_quote_page(
+            page, url, output_dir, take_screenshot, persist, prime_cookies, headless=headless,
+            screenshot_format=screenshot_format, screenshot_full_page=screenshot_full_page
+        )
+
+    if context is not None:
+        page = await _new_page(context)
+        try:
+            return await _scrape_quote_page(
+                page, url, output_dir, take_screenshot, persist, prime_cookies, headless=headless,
+                screenshot_format=screenshot_format, screenshot_full_page=screenshot_full_page
+            )
+        finally:
+            await page.close()
+
+    # A remote browser cannot open a local profile, so only its cookies are kept, in a state file
+    state_path = os.path.join(user_data_dir, "storage_state.json") if user_data_dir and PLAYWRIGHT_WS else None
+
+    async with async_playwright() as p:
+        if state_path:
+            browser, context = await launch_browser(
+                p, headless, storage_state=state_path if os.path.exists(state_path) else None
+            )
+            prime_cookies = not await _has_nse_cookies(context)
+        elif user_data_dir:
+            # Cookies and HTTP cache survive between runs in the profile directory
+            browser = None
+            context = await p.chromium.launch_persistent_context(
+                user_data_dir, headless=headless, args=LAUNCH_ARGS, **CONTEXT_OPTIONS
+            )
+            prime_cookies = not await _has_nse_cookies(context)
+        else:
+            browser, context = await launch_browser(p, headless)
+        try:
+            page = await _new_page(context)
+            return await _scrape_quote_page(
+                page, url, output_dir, take_screenshot, persist, prime_cookies, headless=headless,
+                screenshot_format=screenshot_format, screenshot_full_page=screenshot_full_page
+            )
+        finally:
+            if state_path:
+                try:
+                    os.makedirs(user_data_dir, exist_ok=True)
+                    await context.storage_state(path=state_path)
+                except Exception as e:
+                    print(f"[WARN] Could not save browser cookies: {e}")
             await context.close()
-            await browser.close()
+            if browser is not None:
+                await browser.close()
 
-            return {
-                "status": "success",
-                "url": final_url,  # Return final URL after redirects
-                "original_url": url,
-                "screenshot": screenshot_path if take_screenshot else None,
-                "html": html_path,
-                "json": json_path,
-                "data": parsed_data,
-                "timestamp": timestamp,
-            }
 
-        except Exception as e:
-            print(f"[ERROR] Failed to scrape: {e}")
+async def _has_nse_cookies(context) -> bool:
+    """True when ``context`` already holds cookies for nseindia.com (e.g. from a saved profile)."""
+    return any("nseindia.com" in cookie.get("domain", "") for cookie in await context.cookies())
+
+
+async def scrape_many(
+    urls: list,
+    output_dir: str = "output",
+    headless: bool = True,
+    take_screenshot: bool = False,
+    persist: bool = False,
+    concurrency: int = 8,
+) -> list:
+    """
+    Scrape several equity quote pages with one browser.
+
+    Cookies are primed once on the shared context, then each URL is scraped in
+    its own page, with at most ``concurrency`` pages open at a time. Results
+    come back in the order of ``urls``, shaped like ``scrape_equity_quote``'s.
+    """
+    async with async_playwright() as p:
+        browser, context = await launch_browser(p, headless)
+        try:
+            page = await _new_page(context)
+            try:
+                await _prime_cookies(page)
+            finally:
+                await page.close()
+
+            semaphore = asyncio.Semaphore(concurrency)
+            # One timestamp for the batch; file names differ by the URL's index
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+            async def one(index: int, url: str) -> dict:
+                async with semaphore:
+                    page = await _new_page(context)
+                    try:
+                        return await _scrape_quote_page(
+                            page, url, output_dir, take_screenshot, persist,
+                            prime_cookies=False, file_suffix=f"_{index}", headless=headless,
+                            timestamp=timestamp
+                        )
+                    finally:
+                        await page.close()
+
+            return await asyncio.gather(*(one(i, url) for i, url in enumerate(urls)))
+        finally:
             await context.close()
             await browser.close()
-            return {
-                "status": "error",
-                "url": url,
-                "error": str(e),
-            }
 
 
 def run():
@@ -427,6 +679,8 @@ def run():
             output_dir=OUTPUT_DIR,
             headless=HEADLESS,
             take_screenshot=TAKE_SCREENSHOT,
+            persist=True,
+            user_data_dir=PROFILE_DIR,
         )
     )
     if result.get("status") == "success":
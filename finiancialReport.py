@@ -2,11 +2,43 @@ import asyncio
 import os
 import random
 import sys
+import time
 import argparse
-import json
-from datetime import datetime
+import orjson
+from datetime import date, datetime
 from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
+import nse_http
+from cache import FileCache, make_key
+from browser_pool import (
+    STEALTH_SCRIPT,
+    block_assets,
+    launch_browser,
+    unblock_assets,
+    write_bytes,
+    write_text,
+)
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # BeautifulSoup fallback in parse_financial_results
+    HTMLParser = None
+
+try:
+    import lxml  # noqa: F401  (C-backed tree builder for BeautifulSoup)
+    _SOUP_PARSER = 'lxml'
+except ImportError:
+    _SOUP_PARSER = 'html.parser'
+
+RESULTS_URL = "https://www.nseindia.com/companies-listing/corporate-filings-financial-results-comparision"
+
+# Scrape results reused for the same symbol on the same day (results change a few times a year)
+RESULTS_CACHE = FileCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+DEFAULT_CACHE_TTL = 24 * 60 * 60
+# Cookies (and localStorage) of a primed context, reused while younger than nse_http.COOKIE_TTL
+STATE_FILE = os.getenv(
+    "NSE_STATE_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "nse_state.json")
+)
 
 
 async def human_delay(min_sec: float = 0.5, max_sec: float = 2.0):
@@ -15,35 +47,99 @@ async def human_delay(min_sec: float = 0.5, max_sec: float = 2.0):
     await asyncio.sleep(delay)
 
 
+# Cell texts NSE uses for "no value"; reported as None
+_EMPTY_VALUES = frozenset(('-', '', '—', 'NA', 'N/A'))
+
+# Classes NSE puts on total rows (highlightRow on the <tr>, text-bold on its cells)
+_TOTAL_CLASSES = ('text-bold', 'highlightRow')
+_TOTAL_SELECTOR = ', '.join(f'.{name}' for name in _TOTAL_CLASSES)
+
+
+def _financial_parts_lexbor(html_content: str) -> dict:
+    """Pull the texts the financial results parser needs using selectolax's lexbor (C) HTML parser."""
+    tree = HTMLParser(html_content)
+    line1_elem = tree.css_first('p.line1')
+    container = tree.css_first('div#resultsCompare')
+    table = container.css_first('table.common_table') if container is not None else None
+    thead = table.css_first('thead') if table is not None else None
+    tbody = table.css_first('tbody') if table is not None else None
+    
+    def row_parts(row):
+        # One pass over the row's own cells; a section header row starts with a sectionCol cell
+        tds = [child for child in row.iter() if child.tag == 'td']
+        if tds and 'sectionCol' in (tds[0].attributes.get('class') or '').split():
+            return tds[0].text(strip=True), None, False
+        cells = [cell.text(strip=True) for cell in tds]
+        row_classes = (row.attributes.get('class') or '').split()
+        is_total = any(name in row_classes for name in _TOTAL_CLASSES) or row.css_first(_TOTAL_SELECTOR) is not None
+        return None, cells, is_total
+    
+    return {
+        'company_spans': [span.text(strip=True) for span in line1_elem.css('span')] if line1_elem is not None else [],
+        'has_container': container is not None,
+        'has_table': table is not None,
+        'header_rows': [[cell.text(strip=True) for cell in tr.css('th')] for tr in thead.css('tr')] if thead is not None else None,
+        'rows': [row_parts(row) for row in tbody.css('tr')] if tbody is not None else None,
+    }
+
+
+def _financial_parts_soup(html_content: str) -> dict:
+    """BeautifulSoup equivalent of ``_financial_parts_lexbor`` for installs without selectolax."""
+    soup = BeautifulSoup(html_content, _SOUP_PARSER)
+    line1_elem = soup.find('p', class_='line1')
+    container = soup.find('div', id='resultsCompare')
+    table = container.find('table', class_='common_table') if container else None
+    thead = table.find('thead') if table else None
+    tbody = table.find('tbody') if table else None
+    
+    def row_parts(row):
+        # One pass over the row's own cells; a section header row starts with a sectionCol cell
+        tds = row.find_all('td', recursive=False)
+        if tds and 'sectionCol' in (tds[0].get('class') or []):
+            return tds[0].get_text(strip=True), None, False
+        cells = [cell.get_text(strip=True) for cell in tds]
+        row_classes = row.get('class') or []
+        is_total = any(name in row_classes for name in _TOTAL_CLASSES) or row.find(class_=_TOTAL_CLASSES) is not None
+        return None, cells, is_total
+    
+    return {
+        'company_spans': [span.get_text(strip=True) for span in line1_elem.find_all('span')] if line1_elem else [],
+        'has_container': container is not None,
+        'has_table': table is not None,
+        'header_rows': [[cell.get_text(strip=True) for cell in tr.find_all('th')] for tr in thead.find_all('tr')] if thead else None,
+        'rows': [row_parts(row) for row in tbody.find_all('tr')] if tbody else None,
+    }
+
+
 def parse_financial_results(html_content: str) -> dict:
     """
     Parse the financial results comparison HTML and extract structured data.
     
+    The HTML is parsed with selectolax when installed, otherwise with
+    BeautifulSoup.
+    
     Args:
         html_content: Raw HTML content from the scraped page
     
     Returns:
         dict: Structured financial data with quarters, sections, and line items
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    parts = _financial_parts_lexbor(html_content) if HTMLParser else _financial_parts_soup(html_content)
     
     # Extract company name and symbol (appears before the table)
     company_name = "N/A"
     company_symbol = "N/A"
     
-    # Find the <p class="line1"> which contains company info
-    line1_elem = soup.find('p', class_='line1')
-    if line1_elem:
-        spans = line1_elem.find_all('span')
-        if len(spans) >= 2:
-            # First span (class="lt") has company name
-            company_name = spans[0].get_text(strip=True)
-            # Second span has symbol
-            company_symbol = spans[1].get_text(strip=True)
-    
-    # Find the financial results table (it's inside div#resultsCompare)
-    results_compare_div = soup.find('div', id='resultsCompare')
-    if not results_compare_div:
+    # The <p class="line1"> contains company info
+    spans = parts['company_spans']
+    if len(spans) >= 2:
+        # First span (class="lt") has company name
+        company_name = spans[0]
+        # Second span has symbol
+        company_symbol = spans[1]
+    
+    # The financial results table is inside div#resultsCompare
+    if not parts['has_container']:
         return {
             "status": "error",
             "message": "Financial results container (div#resultsCompare) not found - data may not have loaded",
@@ -53,9 +149,7 @@ def parse_financial_results(html_content: str) -> dict:
             }
         }
     
-    table = results_compare_div.find('table', class_='common_table')
-    
-    if not table:
+    if not parts['has_table']:
         return {
             "status": "error",
             "message": "Financial results table not found inside resultsCompare div",
@@ -66,29 +160,26 @@ def parse_financial_results(html_content: str) -> dict:
         }
     
     # Extract quarter headers
-    thead = table.find('thead')
-    if not thead:
+    header_rows = parts['header_rows']
+    if header_rows is None:
         return {
             "status": "error",
             "message": "Table header not found"
         }
     
-    header_rows = thead.find_all('tr')
     quarters = []
     audit_status = []
     
     if len(header_rows) >= 2:
-        # First row has quarter dates
-        quarter_cells = header_rows[0].find_all('th')[1:]  # Skip first cell (QUARTER ENDED)
-        quarters = [cell.get_text(strip=True) for cell in quarter_cells]
+        # First row has quarter dates; skip first cell (QUARTER ENDED)
+        quarters = header_rows[0][1:]
         
-        # Second row has audit status
-        status_cells = header_rows[1].find_all('th')[1:]  # Skip first cell (PARTICULARS)
-        audit_status = [cell.get_text(strip=True) for cell in status_cells]
+        # Second row has audit status; skip first cell (PARTICULARS)
+        audit_status = header_rows[1][1:]
     
-    # Extract data rows from tbody
-    tbody = table.find('tbody')
-    if not tbody:
+    # Data rows from tbody
+    rows = parts['rows']
+    if rows is None:
         return {
             "status": "error",
             "message": "Table body (tbody) not found - data may not have loaded",
@@ -98,11 +189,10 @@ def parse_financial_results(html_content: str) -> dict:
             }
         }
     
-    rows = tbody.find_all('tr')
-    if not rows or len(rows) < 3:
+    if len(rows) < 3:
         return {
             "status": "error",
-            "message": f"Insufficient data rows found (found {len(rows) if rows else 0} rows)",
+            "message": f"Insufficient data rows found (found {len(rows)} rows)",
             "company": {
                 "name": company_name,
                 "symbol": company_symbol
@@ -112,42 +202,27 @@ def parse_financial_results(html_content: str) -> dict:
     sections = []
     current_section = None
     
-    for row in rows:
+    for section_name, cells, is_total in rows:
         # Check if it's a section header
-        section_header = row.find('td', class_='sectionCol')
-        if section_header:
+        if section_name is not None:
             # Save previous section if exists
             if current_section:
                 sections.append(current_section)
             
             # Start new section
             current_section = {
-                "section_name": section_header.get_text(strip=True),
+                "section_name": section_name,
                 "line_items": []
             }
             continue
         
         # Extract data rows
-        cells = row.find_all('td')
         if len(cells) > 1 and current_section:
-            # First cell is the line item name
-            line_item_name = cells[0].get_text(strip=True)
-            
-            # Rest are values for each quarter
-            values = []
-            for cell in cells[1:]:
-                value_text = cell.get_text(strip=True)
-                # Clean up value (remove commas, handle dash/empty)
-                if value_text in ['-', '']:
-                    value_text = None
-                values.append(value_text)
-            
-            # Check if this is a highlighted/total row
-            is_total = 'text-bold' in str(row) or 'highlightRow' in str(row)
-            
+            # First cell is the line item name; the rest are values for each
+            # quarter as shown (Indian digit grouping kept), with empty cells as None
             current_section["line_items"].append({
-                "name": line_item_name,
-                "values": values,
+                "name": cells[0],
+                "values": [None if value in _EMPTY_VALUES else value for value in cells[1:]],
                 "is_total": is_total
             })
     
@@ -176,378 +251,647 @@ def parse_financial_results(html_content: str) -> dict:
     return result
 
 
-async def scrape_with_search(url: str, search_term: str, output_dir: str = "output", headless: bool = False) -> dict:
-    """
-    Scrape a webpage with form interaction - search for a company and click first suggestion.
-    Uses human-like behavior to avoid bot detection.
+# Returns just the elements parse_financial_results reads (p.line1 and
+# div#resultsCompare), or the whole page when the results never rendered
+RESULTS_FRAGMENT_JS = """() => {
+    const results = document.querySelector('div#resultsCompare');
+    if (!results) return document.documentElement.outerHTML;
+    const line1 = document.querySelector('p.line1');
+    return (line1 ? line1.outerHTML : '') + results.outerHTML;
+}"""
+
+
+# Browser headers (closer to a real Chrome visit)
+PAGE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Referer": "https://www.google.com/",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "same-origin",
+    "Sec-Fetch-User": "?1",
+    "Pragma": "no-cache",
+    "Cache-Control": "no-cache",
+}
+
+
+async def _new_page(context):
+    """Open a page in ``context`` with automation indicators hidden and browser headers set."""
+    page = await context.new_page()
     
-    Args:
-        url: The URL of the page to scrape
-        search_term: Company name or symbol to search (e.g., "RELIANCE")
-        output_dir: Directory to save outputs (screenshots and HTML)
+    # Inject script to hide automation indicators
+    await page.add_init_script(STEALTH_SCRIPT)
     
-    Returns:
-        dict: Contains paths to saved screenshot and HTML file
+    await page.set_extra_http_headers(PAGE_HEADERS)
+    
+    return page
+
+
+async def _prime_cookies(page):
+    """Visit the NSE homepage so ``page`` picks up session cookies."""
+    print(f"[INFO] Priming cookies via NSE homepage...")
+    try:
+        await page.goto("https://www.nseindia.com", wait_until="domcontentloaded", timeout=60000)
+        await human_delay(2, 4)
+    except Exception as e:
+        print(f"[WARN] Failed priming on homepage: {e}")
+
+
+# Candidate selectors, most specific first: the first whose first match is
+# visible wins (a plain CSS union would pick by document order instead, and
+# the catch-all "input"/"button" would match the site header's search)
+INPUT_SELECTORS = (
+    'input[placeholder*="Company name or symbol"]',
+    'input[placeholder*="Company"]',
+    'input[class*="search"]',
+    'input[id*="company"]',
+    'input[type="text"]',
+    'input',
+)
+
+BUTTON_SELECTORS = (
+    'button[type="submit"]',
+    'button[class*="search"]',
+    'button[id*="search"]',
+    'button:has-text("Search")',
+    'input[type="submit"]',
+    'button',
+)
+
+# Autocomplete entries under the search box; any of them will do
+SUGGESTION_SELECTORS = (
+    '.tt-suggestion',
+    '.autocompleteList',
+    'div.autocompleteList',
+    '.ng-option',
+    'a.ng-option',
+    '[role="option"]',
+    '.ng-option-label',
+    'div.ng-option',
+)
+SUGGESTION_SELECTOR = ', '.join(SUGGESTION_SELECTORS)
+
+
+async def _first_visible(page, selectors):
+    """Locator of the first match of the first selector in ``selectors`` that is visible, or None."""
+    for selector in selectors:
+        locator = page.locator(selector).first
+        try:
+            # One round trip per candidate; is_visible is False when nothing matches
+            if await locator.is_visible():
+                print(f"[SUCCESS] Found element with selector: {selector}")
+                return locator
+        except Exception:
+            continue
+    return None
+
+
+async def _search_page(
+    page,
+    url: str,
+    search_term: str,
+    output_dir: str,
+    take_screenshot: bool,
+    persist: bool,
+    prime_cookies: bool = True,
+    screenshot_format: str = "jpeg",
+    screenshot_full_page: bool = False,
+    file_suffix: str = "",
+    headless: bool = False,
+) -> dict:
+    """
+    Run the search-and-scrape flow on an already prepared ``page``.
+
+    ``file_suffix`` is appended to output file names so concurrent scrapes
+    started in the same second do not overwrite each other's files. Headless
+    runs skip the human-like pauses between steps and wait on the page instead.
     """
+    async def pause(min_sec: float, max_sec: float):
+        if not headless:
+            await human_delay(min_sec, max_sec)
     
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    # Create output directory if we are going to write anything to it
+    if take_screenshot or persist:
+        os.makedirs(output_dir, exist_ok=True)
     
     # Generate timestamp for unique filenames
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     domain = url.split("//")[-1].split("/")[0].replace(".", "_")
     
-    screenshot_path = os.path.join(output_dir, f"{domain}_screenshot_{timestamp}.png")
-    html_path = os.path.join(output_dir, f"{domain}_page_{timestamp}.html")
-    json_path = os.path.join(output_dir, f"{domain}_data_{timestamp}.json")
+    screenshot_ext = "jpg" if screenshot_format == "jpeg" else screenshot_format
+    screenshot_path = os.path.join(output_dir, f"{domain}_screenshot_{timestamp}{file_suffix}.{screenshot_ext}")
+    html_path = os.path.join(output_dir, f"{domain}_page_{timestamp}{file_suffix}.html")
+    json_path = os.path.join(output_dir, f"{domain}_data_{timestamp}{file_suffix}.json")
     
-    async with async_playwright() as p:
-        # Launch browser with optimized args for better performance and stability
-        browser = await p.chromium.launch(
-            headless=headless,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage', 
-                '--disable-gpu',
-                '--disable-extensions',
-                '--disable-background-timer-throttling',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-renderer-backgrounding',
-                '--window-size=1920,1080',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-http2'
-            ]
-        )
+    cookies_expired = False
+    route_handler = await block_assets(page, take_screenshot)
+    try:
+        # Skipped when the context already carries cookies (e.g. from the browser pool)
+        if prime_cookies:
+            await _prime_cookies(page)
         
-        context = await browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            ignore_https_errors=True,
-            java_script_enabled=True,
-            reduced_motion='no-preference'
-        )
+        print(f"[INFO] Opening page: {url}")
+        # Navigate to the page with retries to avoid transient HTTP/2 issues
+        goto_success = False
+        for attempt in range(3):
+            try:
+                # Assets are blocked (see block_assets) and readiness is the selector wait
+                # below, so don't hold out for network idle
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=90000)  # 90s max
+                if response is not None and response.status in (401, 403) and not cookies_expired:
+                    # Borrowed cookies went stale: prime this page and retry
+                    cookies_expired = True
+                    await _prime_cookies(page)
+                    raise RuntimeError(f"HTTP {response.status} with shared cookies")
+                # Wait for main content selectors
+                await page.wait_for_selector('main#midBody, div#resultsCompare', timeout=30000)
+                goto_success = True
+                break
+            except Exception as e:
+                print(f"[WARN] goto attempt {attempt+1} failed: {e}")
+                if attempt == 2:
+                    raise
+                await human_delay(2, 4)
         
-        page = await context.new_page()
         
-        # Inject script to hide automation indicators
-        await page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => false,
-            });
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5],
-            });
-        """)
+        print(f"[INFO] Waiting for page to fully load...")
+        await pause(2, 4)
+        if headless:
+            try:
+                await page.wait_for_selector(INPUT_SELECTORS[0], state='visible', timeout=10000)
+            except Exception as e:
+                print(f"[WARN] Search input not visible yet (continuing anyway): {e}")
+        
+        # Move mouse around to simulate human activity
+        await page.mouse.move(random.randint(100, 500), random.randint(100, 500))
+        await pause(0.5, 1)
+        
+        print(f"[INFO] Looking for company search input field...")
+        input_field = await _first_visible(page, INPUT_SELECTORS)
         
-        # Set browser headers (closer to a real Chrome visit)
-        await page.set_extra_http_headers({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Referer": "https://www.google.com/",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "same-origin",
-            "Sec-Fetch-User": "?1",
-            "Pragma": "no-cache",
-            "Cache-Control": "no-cache",
-        })
+        if not input_field:
+            print(f"[ERROR] Could not find company search input field")
+            return {
+                "status": "error",
+                "url": url,
+                "error": "Could not find search input field"
+            }
         
+        # Scroll to input field
+        await input_field.scroll_into_view_if_needed()
+        await pause(1, 2)
+        
+        # Move mouse to input field
+        box = await input_field.bounding_box()
+        if box:
+            await page.mouse.move(int(box['x'] + box['width'] / 2), int(box['y'] + box['height'] / 2))
+        await pause(0.5, 1.5)
+        
+        # Click the input field
+        print(f"[INFO] Clicking on input field...")
+        await input_field.click()
+        await pause(1, 2)
+        
+        # Clear any existing text, then type the symbol in one call; the key
+        # events still fire the input handlers that load the suggestions
+        await input_field.fill("")
+        print(f"[INFO] Typing '{search_term}' in search field...")
+        await input_field.type(search_term, delay=20)
+        await human_delay(0.1, 0.3)
+        
+        print(f"[INFO] Waiting for suggestions to appear...")
         try:
-            print(f"[INFO] Priming cookies via NSE homepage...")
+            await page.wait_for_selector(SUGGESTION_SELECTOR, state='visible', timeout=5000)
+        except Exception:
+            print(f"[WARN] No suggestion dropdown appeared yet")
+        await pause(0.3, 0.8)
+        
+        print(f"[INFO] Looking for suggestion matching '{search_term}'...")
+        
+        suggestion_found = False
+        # Try to find and click the correct suggestion; the (case-insensitive)
+        # text match runs in the browser, one query per selector
+        for selector in SUGGESTION_SELECTORS:
+            suggestion = page.locator(f'{selector}:visible').filter(has_text=search_term).first
             try:
-                await page.goto("https://www.nseindia.com", wait_until="domcontentloaded", timeout=60000)
-                await human_delay(2, 4)
-            except Exception as e:
-                print(f"[WARN] Failed priming on homepage: {e}")
-            
-            print(f"[INFO] Opening page: {url}")
-            # Navigate to the page with retries to avoid transient HTTP/2 issues
-            goto_success = False
-            for attempt in range(3):
-                try:
-                    await page.goto(url, wait_until="networkidle", timeout=90000)  # 90s max
-                    # Wait for main content selectors
-                    await page.wait_for_selector('main#midBody, div#resultsCompare', timeout=30000)
-                    # Trigger lazy load by scrolling
-                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await page.wait_for_timeout(5000)  # Stabilize
-                    goto_success = True
-                    break
-                except Exception as e:
-                    print(f"[WARN] goto attempt {attempt+1} failed: {e}")
-                    if attempt == 2:
-                        raise
-                    await human_delay(2, 4)
-            
-            
-            print(f"[INFO] Waiting for page to fully load...")
-            await human_delay(2, 4)
-            
-            # Move mouse around to simulate human activity
-            await page.mouse.move(random.randint(100, 500), random.randint(100, 500))
-            await human_delay(0.5, 1)
-            
-            print(f"[INFO] Looking for company search input field...")
-            # Find the input field - try multiple selectors
-            input_selectors = [
-                'input[placeholder*="Company name or symbol"]',
-                'input[placeholder*="Company"]',
-                'input[class*="search"]',
-                'input[id*="company"]',
-                'input[type="text"]',
-                'input',
-            ]
-            
-            input_field = None
-            for selector in input_selectors:
-                try:
-                    elements = page.locator(selector)
-                    count = await elements.count()
-                    if count > 0:
-                        input_field = elements.first
-                        if await input_field.is_visible():
-                            print(f"[SUCCESS] Found input field with selector: {selector}")
-                            break
-                except:
+                if not await suggestion.is_visible():
                     continue
-            
-            if not input_field:
-                print(f"[ERROR] Could not find company search input field")
-                await context.close()
-                await browser.close()
-                return {
-                    "status": "error",
-                    "url": url,
-                    "error": "Could not find search input field"
-                }
-            
-            # Scroll to input field
-            await input_field.scroll_into_view_if_needed()
-            await human_delay(1, 2)
-            
-            # Move mouse to input field
-            box = await input_field.bounding_box()
-            if box:
-                await page.mouse.move(int(box['x'] + box['width'] / 2), int(box['y'] + box['height'] / 2))
-            await human_delay(0.5, 1.5)
-            
-            # Click the input field
-            print(f"[INFO] Clicking on input field...")
-            await input_field.click()
-            await human_delay(1, 2)
-            
-            # Clear any existing text using Ctrl+A and Delete
-            await input_field.press("Control+A")
-            await human_delay(0.2, 0.4)
-            await input_field.press("Backspace")
-            await human_delay(0.3, 0.7)
-            
-            # Type with realistic delays (character by character)
-            print(f"[INFO] Typing '{search_term}' in search field with realistic delays...")
-            for char in search_term:
-                await input_field.type(char, delay=random.randint(50, 150))
-                await human_delay(0.05, 0.2)
-            
-            print(f"[INFO] Waiting for suggestions to appear...")
-            await human_delay(3, 5)
-            
-            # Try to find and click the correct suggestion
-            print(f"[INFO] Looking for suggestion matching '{search_term}'...")
-            suggestion_selectors = [
-                '.tt-suggestion',
-                '.autocompleteList',
-                'div.autocompleteList',
-                '.ng-option',
-                'a.ng-option',
-                '[role="option"]',
-                '.ng-option-label',
-                'div.ng-option',
-            ]
-            
-            suggestion_found = False
-            for selector in suggestion_selectors:
-                try:
-                    suggestions = page.locator(selector)
-                    count = await suggestions.count()
-                    if count > 0:
-                        print(f"[SUCCESS] Found {count} suggestions with selector: {selector}")
-                        
-                        # Loop through suggestions to find the one matching our search term
-                        for i in range(count):
-                            suggestion = suggestions.nth(i)
-                            try:
-                                suggestion_text = await suggestion.inner_text()
-                                suggestion_text = suggestion_text.strip()
-                                print(f"[DEBUG] Suggestion {i+1}: '{suggestion_text}'")
-                                
-                                # Match if search term appears anywhere in the suggestion
-                                search_upper = search_term.upper()
-                                suggestion_upper = suggestion_text.upper()
-                                
-                                # Check if search term is in the suggestion text
-                                if search_upper in suggestion_upper:
-                                        print(f"[INFO] ✓ Found matching suggestion: {suggestion_text}")
-                                        
-                                        try:
-                                            is_visible = await suggestion.is_visible(timeout=2000)
-                                            if is_visible:
-                                                await suggestion.scroll_into_view_if_needed()
-                                                await human_delay(0.3, 0.8)
-                                                
-                                                print(f"[INFO] Clicking on: {suggestion_text}")
-                                                await suggestion.click(force=True, timeout=10000)
-                                                print(f"[SUCCESS] Clicked successfully")
-                                                await human_delay(1, 2)
-                                                suggestion_found = True
-                                                break
-                                        except Exception as e:
-                                            print(f"[WARN] Error clicking suggestion: {str(e)}")
-                                            continue
-                            except Exception as e:
-                                print(f"[DEBUG] Error processing suggestion {i+1}: {str(e)}")
-                                continue
-                        
-                        if suggestion_found:
-                            break
-                except Exception as e:
-                    print(f"[DEBUG] Failed with selector '{selector}': {str(e)}")
-                    continue
-            
-            if not suggestion_found:
-                print(f"[WARN] Could not find exact match, trying first suggestion as fallback...")
-                try:
-                    # Try to click the first suggestion as last resort
-                    # Try multiple selectors
-                    for fallback_selector in ['.tt-suggestion', '.autocompleteList', '.ng-option']:
-                        try:
-                            first_suggestion = page.locator(fallback_selector).first
-                            if await first_suggestion.is_visible(timeout=2000):
-                                suggestion_text = await first_suggestion.inner_text()
-                                print(f"[INFO] Clicking first suggestion: {suggestion_text}")
-                                await first_suggestion.click(force=True, timeout=10000)
-                                print(f"[SUCCESS] Clicked first suggestion")
-                                await human_delay(1, 2)
-                                suggestion_found = True
-                                break
-                        except:
-                            continue
-                except Exception as e:
-                    print(f"[WARN] Fallback also failed: {str(e)}")
-            
-            if not suggestion_found:
-                print(f"[WARN] Could not find suggestion dropdown, trying keyboard navigation...")
-                await human_delay(0.5, 1)
-                await input_field.press("ArrowDown")
-                await human_delay(0.3, 0.8)
-                await input_field.press("Enter")
-            
-            print(f"[INFO] Waiting after selecting suggestion...")
-            await human_delay(2, 4)
-            
-            print(f"[INFO] Looking for search button...")
-            # Find and click search button
-            button_selectors = [
-                'button[type="submit"]',
-                'button[class*="search"]',
-                'button[id*="search"]',
-                'button:has-text("Search")',
-                'input[type="submit"]',
-                'button',
-            ]
-            
-            button_found = False
-            for selector in button_selectors:
-                try:
-                    buttons = page.locator(selector)
-                    count = await buttons.count()
-                    if count > 0:
-                        button = buttons.first
-                        if await button.is_visible():
-                            print(f"[SUCCESS] Found search button with selector: {selector}")
-                            
-                            # Move mouse to button
-                            box = await button.bounding_box()
-                            if box:
-                                await page.mouse.move(int(box['x'] + box['width'] / 2), int(box['y'] + box['height'] / 2))
-                            await human_delay(0.5, 1.5)
-                            
-                            # Click button
-                            await button.click()
-                            button_found = True
+                suggestion_text = (await suggestion.inner_text()).strip()
+                print(f"[INFO] ✓ Found matching suggestion with selector {selector}: {suggestion_text}")
+                
+                await suggestion.scroll_into_view_if_needed()
+                await pause(0.3, 0.8)
+                
+                print(f"[INFO] Clicking on: {suggestion_text}")
+                await suggestion.click(force=True, timeout=10000)
+                print(f"[SUCCESS] Clicked successfully")
+                await pause(1, 2)
+                suggestion_found = True
+                break
+            except Exception as e:
+                print(f"[WARN] Error clicking suggestion with selector '{selector}': {str(e)}")
+                continue
+        
+        if not suggestion_found:
+            print(f"[WARN] Could not find exact match, trying first suggestion as fallback...")
+            try:
+                # Try to click the first suggestion as last resort
+                # Try multiple selectors
+                for fallback_selector in ['.tt-suggestion', '.autocompleteList', '.ng-option']:
+                    try:
+                        first_suggestion = page.locator(fallback_selector).first
+                        if await first_suggestion.is_visible(timeout=2000):
+                            suggestion_text = await first_suggestion.inner_text()
+                            print(f"[INFO] Clicking first suggestion: {suggestion_text}")
+                            await first_suggestion.click(force=True, timeout=10000)
+                            print(f"[SUCCESS] Clicked first suggestion")
+                            await pause(1, 2)
+                            suggestion_found = True
                             break
-                except:
-                    continue
-            
-            if not button_found:
-                print(f"[WARN] Could not find search button, pressing Enter instead...")
-                await input_field.press("Enter")
-            
-            print(f"[INFO] Waiting for results to load and JavaScript to render...")
-            await human_delay(8, 12)
-            
-            # Check if table loaded by looking for the results table
-            print(f"[INFO] Checking if financial results table loaded...")
+                    except:
+                        continue
+            except Exception as e:
+                print(f"[WARN] Fallback also failed: {str(e)}")
+        
+        if not suggestion_found:
+            print(f"[WARN] Could not find suggestion dropdown, trying keyboard navigation...")
+            await pause(0.5, 1)
+            await input_field.press("ArrowDown")
+            await pause(0.3, 0.8)
+            await input_field.press("Enter")
+        
+        print(f"[INFO] Waiting after selecting suggestion...")
+        await pause(2, 4)
+        
+        print(f"[INFO] Looking for search button...")
+        button_found = False
+        button = await _first_visible(page, BUTTON_SELECTORS)
+        if button:
             try:
-                table_selector = 'table.common_table'
-                table_locator = page.locator(table_selector)
-                await table_locator.wait_for(state='visible', timeout=15000)
-                print(f"[SUCCESS] Financial results table is visible")
+                # Move mouse to button
+                box = await button.bounding_box()
+                if box:
+                    await page.mouse.move(int(box['x'] + box['width'] / 2), int(box['y'] + box['height'] / 2))
+                await pause(0.5, 1.5)
+                
+                # Click button
+                await button.click()
+                button_found = True
             except Exception as e:
-                print(f"[WARN] Table may not have loaded: {str(e)}")
-                print(f"[INFO] Waiting additional 5 seconds...")
-                await human_delay(5, 7)
-            
+                print(f"[WARN] Error clicking search button: {str(e)}")
+        
+        if not button_found:
+            print(f"[WARN] Could not find search button, pressing Enter instead...")
+            await input_field.press("Enter")
+        
+        # Resolve as soon as the results table has rows (the parser needs at least three)
+        print(f"[INFO] Waiting for financial results table to load...")
+        try:
+            await page.wait_for_selector(
+                'div#resultsCompare table.common_table tbody tr:nth-child(3)', timeout=20000
+            )
+            print(f"[SUCCESS] Financial results table is loaded")
+        except Exception as e:
+            print(f"[WARN] Table may not have loaded: {str(e)}")
+            print(f"[INFO] Waiting additional 5 seconds...")
+            await human_delay(5, 7)
+        
+        # The screenshot (encoded by the browser) and the file writes (on worker
+        # threads) run alongside fetching and parsing the HTML
+        pending = []
+        if take_screenshot:
             print(f"[INFO] Taking screenshot...")
-            await page.screenshot(path=screenshot_path, full_page=True)
-            print(f"[SUCCESS] Screenshot saved to: {screenshot_path}")
-            
+            # JPEG encodes several times faster than PNG
+            pending.append(asyncio.create_task(page.screenshot(
+                path=screenshot_path,
+                type=screenshot_format,
+                quality=70 if screenshot_format == "jpeg" else None,
+                full_page=screenshot_full_page
+            )))
+        
+        # The full page is only serialised when it is being saved; the parser
+        # needs about a tenth of it
+        html_content = await (page.content() if persist else page.evaluate(RESULTS_FRAGMENT_JS))
+        
+        if persist:
             print(f"[INFO] Saving HTML content...")
-            html_content = await page.content()
-            
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            pending.append(asyncio.create_task(asyncio.to_thread(write_text, html_path, html_content)))
+        
+        # Parsed on a worker thread so the event loop keeps driving the other pages of a batch
+        print(f"[INFO] Parsing financial data from HTML...")
+        parsed_data = await asyncio.to_thread(parse_financial_results, html_content)
+        
+        if parsed_data.get("status") == "success":
+            print(f"[SUCCESS] Extracted {parsed_data['metadata']['total_sections']} sections with {parsed_data['metadata']['total_quarters']} quarters")
+            
+            # Save parsed data as JSON
+            if persist:
+                pending.append(asyncio.create_task(asyncio.to_thread(
+                    write_bytes, json_path,
+                    orjson.dumps(parsed_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                )))
+        else:
+            print(f"[WARN] Failed to parse financial data: {parsed_data.get('message')}")
+        
+        await asyncio.gather(*pending)
+        if take_screenshot:
+            print(f"[SUCCESS] Screenshot saved to: {screenshot_path}")
+        if persist:
             print(f"[SUCCESS] HTML saved to: {html_path}")
-            
-            print(f"[INFO] Parsing financial data from HTML...")
-            parsed_data = parse_financial_results(html_content)
-            
             if parsed_data.get("status") == "success":
-                print(f"[SUCCESS] Extracted {parsed_data['metadata']['total_sections']} sections with {parsed_data['metadata']['total_quarters']} quarters")
-                
-                # Save parsed data as JSON
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(parsed_data, f, indent=2, ensure_ascii=False)
                 print(f"[SUCCESS] Parsed data saved to: {json_path}")
-            else:
-                print(f"[WARN] Failed to parse financial data: {parsed_data.get('message')}")
-            
-            await context.close()
-            await browser.close()
-            
-            return {
-                "status": "success",
-                "url": url,
-                "search_term": search_term,
-                "screenshot": screenshot_path,
-                "html": html_path,
-                "json": json_path,
-                "parsed_data": parsed_data,
-                "timestamp": timestamp
-            }
-            
-        except Exception as e:
-            print(f"[ERROR] Failed to scrape: {str(e)}")
+        
+        return {
+            "status": "success",
+            "url": url,
+            "search_term": search_term,
+            "screenshot": screenshot_path if take_screenshot else None,
+            "html": html_path if persist else None,
+            "json": json_path if persist else None,
+            "parsed_data": parsed_data,
+            "timestamp": timestamp,
+            "cookies_expired": cookies_expired
+        }
+        
+    except Exception as e:
+        print(f"[ERROR] Failed to scrape: {str(e)}")
+        return {
+            "status": "error",
+            "url": url,
+            "search_term": search_term,
+            "error": str(e),
+            "cookies_expired": cookies_expired
+        }
+    finally:
+        await unblock_assets(page, route_handler)
+
+
+async def _cached_result(url: str, search_term: str, cache_ttl: float, scrape) -> dict:
+    """
+    Return today's cached result for ``search_term`` if younger than
+    ``cache_ttl`` seconds, otherwise await ``scrape()`` and cache it when the
+    table was parsed successfully.
+    """
+    key = make_key(url, search_term.upper(), date.today().isoformat())
+    cached = RESULTS_CACHE.get("financial-results", key, cache_ttl)
+    if cached is not None:
+        print(f"[INFO] Using cached financial results for {search_term}")
+        return cached
+    result = await scrape()
+    if result.get("status") == "success" and (result.get("parsed_data") or {}).get("status") == "success":
+        RESULTS_CACHE.set("financial-results", key, result, cache_ttl)
+    return result
+
+
+async def scrape_with_search(
+    url: str,
+    search_term: str,
+    output_dir: str = "output",
+    headless: bool = False,
+    context=None,
+    take_screenshot: bool = False,
+    persist: bool = False,
+    prime_cookies: bool = True,
+    page=None,
+    screenshot_format: str = "jpeg",
+    screenshot_full_page: bool = False,
+    try_http: bool = False,
+    cache_ttl: float = None,
+) -> dict:
+    """
+    Scrape a webpage with form interaction - search for a company and click first suggestion.
+    Uses human-like behavior to avoid bot detection.
+    
+    With ``try_http`` (and no screenshot or saved files), the results are
+    first fetched from NSE's JSON API over plain HTTP (see ``nse_http``), and
+    the browser is only used when that fails. That report is partial (only the
+    line items the API exposes), so it is off by default.
+    
+    Args:
+        url: The URL of the page to scrape
+        search_term: Company name or symbol to search (e.g., "RELIANCE")
+        output_dir: Directory to save outputs (screenshots and HTML)
+        take_screenshot: Save a screenshot to output_dir
+        screenshot_format: "jpeg" (default, quality 70) or "png"
+        screenshot_full_page: Capture the whole page instead of the viewport
+        persist: Save the rendered HTML and parsed JSON to output_dir;
+            otherwise they are only kept in memory
+        context: Existing browser context to scrape in (e.g. from the API's
+            browser pool); it is left open. When omitted a fresh Chromium is
+            launched and closed for this call.
+        prime_cookies: Visit the NSE homepage first; pass False when ``context``
+            already holds NSE cookies. ``cookies_expired`` in the result
+            reports that NSE rejected them and the page primed its own.
+        page: Long-lived page to reuse (e.g. the one the browser pool keeps
+            per context); only this scraper's headers are applied and it is
+            left open.
+        try_http: Try NSE's JSON API before the browser, accepting a partial report
+        cache_ttl: Reuse a successful result for the same symbol from today
+            that is at most this many seconds old (stored under ``.cache/``;
+            file paths in it point to the files written by that scrape).
+            Off by default.
+    
+    Returns:
+        dict: Parsed data plus paths to any saved screenshot/HTML/JSON files
+    """
+    if cache_ttl:
+        return await _cached_result(url, search_term, cache_ttl, lambda: scrape_with_search(
+            url, search_term, output_dir=output_dir, headless=headless, context=context,
+            take_screenshot=take_screenshot, persist=persist, prime_cookies=prime_cookies, page=page,
+            screenshot_format=screenshot_format, screenshot_full_page=screenshot_full_page,
+            try_http=try_http
+        ))
+    
+    if try_http and not take_screenshot and not persist:
+        try:
+            return await nse_http.fetch_financial_report(search_term, url)
+        except nse_http.FallbackNeeded as e:
+            print(f"[WARN] HTTP fast path failed, falling back to browser: {e}")
+    
+    if page is not None:
+        await page.set_extra_http_headers(PAGE_HEADERS)
+        return await _search_page(page, url, search_term, output_dir, take_screenshot, persist, prime_cookies, screenshot_format, screenshot_full_page, headless=headless)
+    
+    if context is not None:
+        page = await _new_page(context)
+        try:
+            return await _search_page(page, url, search_term, output_dir, take_screenshot, persist, prime_cookies, screenshot_format, screenshot_full_page, headless=headless)
+        finally:
+            await page.close()
+    
+    async with async_playwright() as p:
+        browser, context = await launch_browser(p, headless)
+        try:
+            page = await _new_page(context)
+            return await _search_page(page, url, search_term, output_dir, take_screenshot, persist, True, screenshot_format, screenshot_full_page, headless=headless)
+        finally:
             await context.close()
             await browser.close()
-            return {
-                "status": "error",
-                "url": url,
-                "search_term": search_term,
-                "error": str(e)
-            }
+
+
+def _fresh_state(path: str):
+    """Return ``path`` if it holds a storage state saved less than ``COOKIE_TTL`` seconds ago, else None."""
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return None
+    return path if age <= nse_http.COOKIE_TTL else None
+
+
+async def scrape_many(
+    search_terms: list,
+    output_dir: str = "output",
+    headless: bool = True,
+    take_screenshot: bool = False,
+    persist: bool = False,
+    max_concurrency: int = 5,
+    cache_ttl: float = None,
+    state_file: str = None,
+) -> list:
+    """Scrape the financial results of several symbols with one browser (see ``Scraper.scrape_many``)."""
+    async with Scraper(
+        output_dir=output_dir, headless=headless, take_screenshot=take_screenshot, persist=persist,
+        cache_ttl=cache_ttl, state_file=state_file
+    ) as scraper:
+        return await scraper.scrape_many(search_terms, max_concurrency)
+
+
+class Scraper:
+    """
+    One warm browser for scraping the financial results of many symbols.
+    
+    Chromium (or the ``PLAYWRIGHT_WS`` server) is started once, when the first
+    symbol needs the browser, the NSE homepage is visited once to prime the
+    shared context's cookies, and each browser scrape then runs in a fresh page
+    of that context. With ``cache_ttl`` results from earlier the same day are
+    reused (see ``scrape_with_search``). With ``state_file`` the context's
+    cookies are saved there on ``stop()`` and the next ``Scraper`` restores
+    them instead of visiting the homepage, while the file is younger than
+    ``COOKIE_TTL`` seconds:
+    
+        async with Scraper(headless=True) as scraper:
+            for symbol in ("RELIANCE", "TCS"):
+                result = await scraper.scrape(symbol)
+    
+    Results are shaped like ``scrape_with_search``'s.
+    """
+    
+    def __init__(
+        self,
+        url: str = RESULTS_URL,
+        output_dir: str = "output",
+        headless: bool = False,
+        take_screenshot: bool = False,
+        persist: bool = False,
+        cache_ttl: float = None,
+        state_file: str = None,
+        try_http: bool = False,
+    ):
+        self.url = url
+        self.output_dir = output_dir
+        self.headless = headless
+        self.take_screenshot = take_screenshot
+        self.persist = persist
+        self.cache_ttl = cache_ttl
+        self.state_file = state_file
+        self.try_http = try_http
+        self._playwright = None
+        self.browser = None
+        self.context = None
+        self._start_lock = asyncio.Lock()
+    
+    async def start(self):
+        """Start the browser and prime the shared context's NSE cookies (once)."""
+        async with self._start_lock:
+            if self.context is not None:
+                return
+            self._playwright = await async_playwright().start()
+            state = _fresh_state(self.state_file) if self.state_file else None
+            self.browser, self.context = await launch_browser(self._playwright, self.headless, storage_state=state)
+            if state:
+                print(f"[INFO] Reusing NSE cookies from {state}")
+                return
+            page = await _new_page(self.context)
+            try:
+                await _prime_cookies(page)
+            finally:
+                await page.close()
+    
+    async def scrape(self, search_term: str, file_suffix: str = "") -> dict:
+        """
+        Scrape the results comparison of ``search_term``: from the cache when
+        enabled, from NSE's JSON API (a partial report) with ``try_http`` when
+        no files are wanted, otherwise (or if those miss) by searching for it
+        in a new page.
+        """
+        if self.cache_ttl:
+            return await _cached_result(
+                self.url, search_term, self.cache_ttl, lambda: self._scrape(search_term, file_suffix)
+            )
+        return await self._scrape(search_term, file_suffix)
+    
+    async def _scrape(self, search_term: str, file_suffix: str) -> dict:
+        if self.try_http and not self.take_screenshot and not self.persist:
+            try:
+                return await nse_http.fetch_financial_report(search_term, self.url)
+            except nse_http.FallbackNeeded as e:
+                print(f"[WARN] HTTP fast path failed, falling back to browser: {e}")
+        await self.start()
+        page = await _new_page(self.context)
+        try:
+            # A page rejected by NSE re-primes itself, refreshing the shared context's cookies
+            return await _search_page(
+                page, self.url, search_term, self.output_dir, self.take_screenshot, self.persist, False,
+                file_suffix=file_suffix, headless=self.headless
+            )
+        finally:
+            await page.close()
+    
+    async def scrape_many(self, search_terms: list, max_concurrency: int = 5) -> list:
+        """
+        Scrape several symbols concurrently, with at most ``max_concurrency``
+        pages open at once. Results come back in the order of ``search_terms``.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def one(index: int, search_term: str) -> dict:
+            async with semaphore:
+                return await self.scrape(search_term, file_suffix=f"_{index}")
+        
+        results = await asyncio.gather(
+            *(one(i, term) for i, term in enumerate(search_terms)), return_exceptions=True
+        )
+        return [
+            {"status": "error", "url": self.url, "search_term": term, "error": str(result)}
+            if isinstance(result, Exception) else result
+            for term, result in zip(search_terms, results)
+        ]
+    
+    async def stop(self):
+        """Save the cookies to ``state_file`` (if set), then close the context and browser (or disconnect from the server)."""
+        if self.context is not None:
+            if self.state_file:
+                try:
+                    os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+                    await self.context.storage_state(path=self.state_file)
+                except Exception as e:
+                    print(f"[WARN] Could not save NSE cookies to {self.state_file}: {e}")
+            await self.context.close()
+        if self.browser is not None:
+            await self.browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._playwright = self.browser = self.context = None
+    
+    async def __aenter__(self):
+        # The browser is started by the first scrape that needs it
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.stop()
 
 
 if __name__ == "__main__":
@@ -560,13 +904,15 @@ Examples:
   python interactive_scraper.py -s RELIANCE
   python interactive_scraper.py -s TCS
   python interactive_scraper.py -s INFY -o ./custom_output
+  python interactive_scraper.py -s RELIANCE,TCS,INFY
+  python interactive_scraper.py -s RELIANCE --screenshot
         """
     )
     
     parser.add_argument(
         '-s', '--symbol',
         required=True,
-        help='Stock symbol to search (e.g., RELIANCE, TCS, INFY, HDFC, ICICI)'
+        help='Stock symbol to search (e.g., RELIANCE, TCS, INFY, HDFC, ICICI), or several separated by commas'
     )
     
     parser.add_argument(
@@ -581,37 +927,64 @@ Examples:
         help='Run in headless mode (no browser window)'
     )
     
+    parser.add_argument(
+        '--screenshot',
+        action='store_true',
+        help='Also save a screenshot of the results (slowest step; off by default)'
+    )
+    
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        help=f'Reuse a result for the same symbol from today up to this many seconds old (default: {DEFAULT_CACHE_TTL})'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always scrape fresh, ignoring cached results'
+    )
+    
     args = parser.parse_args()
     
     # Print header
     print("[START] Interactive Web Scraper with Playwright")
     print(f"Mode: JavaScript Rendering Enabled | Headless: {args.headless} | Wait Time: 10s")
-    print(f"Stock Symbol: {args.symbol}\n")
+    print(f"Stock Symbol(s): {args.symbol}\n")
     
-    url = "https://www.nseindia.com/companies-listing/corporate-filings-financial-results-comparision"
-    search_term = args.symbol.upper()
+    search_terms = [term.strip().upper() for term in args.symbol.split(',') if term.strip()]
     
-    result = asyncio.run(scrape_with_search(url, search_term, output_dir=args.output, headless=args.headless))
+    async def main():
+        cache_ttl = None if args.no_cache else args.cache_ttl
+        async with Scraper(
+            output_dir=args.output, headless=args.headless, take_screenshot=args.screenshot, persist=True,
+            cache_ttl=cache_ttl, state_file=STATE_FILE
+        ) as scraper:
+            if len(search_terms) == 1:
+                return [await scraper.scrape(search_terms[0])]
+            return await scraper.scrape_many(search_terms)
     
-    if result.get("status") == "success":
-        print(f"\n[FINAL] ✓ Scraping completed successfully!")
-        print(f"  Stock Symbol: {result['search_term']}")
-        print(f"  Screenshot: {result['screenshot']}")
-        print(f"  HTML: {result['html']}")
-        print(f"  JSON: {result.get('json', 'N/A')}")
-        
-        # Print summary of parsed data
-        parsed_data = result.get('parsed_data', {})
-        if parsed_data.get('status') == 'success':
-            print(f"\n[DATA SUMMARY]")
-            print(f"  Company: {parsed_data['company']['name']} ({parsed_data['company']['symbol']})")
-            print(f"  Quarters: {', '.join(parsed_data['quarters'])}")
-            print(f"  Total Sections: {parsed_data['metadata']['total_sections']}")
-            print(f"  Currency: {parsed_data['currency']}")
-            
-            # Print section names
-            print(f"\n[SECTIONS EXTRACTED]")
-            for i, section in enumerate(parsed_data['sections'], 1):
-                print(f"  {i}. {section['section_name']} ({len(section['line_items'])} line items)")
-    else:
-        print(f"\n[FINAL] ✗ Scraping failed: {result.get('error')}")
+    for result in asyncio.run(main()):
+        if result.get("status") == "success":
+            print(f"\n[FINAL] ✓ Scraping completed successfully!")
+            print(f"  Stock Symbol: {result['search_term']}")
+            print(f"  Screenshot: {result['screenshot']}")
+            print(f"  HTML: {result['html']}")
+            print(f"  JSON: {result.get('json', 'N/A')}")
+            
+            # Print summary of parsed data
+            parsed_data = result.get('parsed_data', {})
+            if parsed_data.get('status') == 'success':
+                print(f"\n[DATA SUMMARY]")
+                print(f"  Company: {parsed_data['company']['name']} ({parsed_data['company']['symbol']})")
+                print(f"  Quarters: {', '.join(parsed_data['quarters'])}")
+                print(f"  Total Sections: {parsed_data['metadata']['total_sections']}")
+                print(f"  Currency: {parsed_data['currency']}")
+                
+                # Print section names
+                print(f"\n[SECTIONS EXTRACTED]")
+                for i, section in enumerate(parsed_data['sections'], 1):
+                    print(f"  {i}. {section['section_name']} ({len(section['line_items'])} line items)")
+        else:
+            print(f"\n[FINAL] ✗ Scraping failed for {result.get('search_term')}: {result.get('error')}")
@@ -0,0 +1,40 @@
+"""
+Prometheus metrics for the API, served at /metrics.
+
+Each gunicorn worker keeps its own registry, so a scrape of /metrics reports
+the worker that answered it.
+"""
+
+from prometheus_client import Gauge, Histogram, make_wsgi_app
+
+CACHE_LOOKUP_SECONDS = Histogram(
+    "nse_cache_lookup_seconds", "Response cache lookup time", ["endpoint"]
+)
+POOL_WAIT_SECONDS = Histogram(
+    "nse_browser_pool_wait_seconds", "Time spent waiting to borrow a pooled browser context"
+)
+SCRAPE_SECONDS = Histogram(
+    "nse_scrape_seconds",
+    "Time to produce a fresh successful response (HTTP fast path or browser scrape)",
+    ["endpoint"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600),
+)
+JSON_ENCODE_SECONDS = Histogram(
+    "nse_json_encode_seconds", "Time spent encoding a response body to JSON"
+)
+POOL_SIZE = Gauge("nse_browser_pool_size", "Browser contexts in the pool")
+POOL_IN_USE = Gauge("nse_browser_pool_in_use", "Browser contexts currently borrowed")
+INFLIGHT_SCRAPES = Gauge("nse_inflight_scrapes", "Distinct scrapes running or waiting for a context")
+
+metrics_app = make_wsgi_app()
+
+__all__ = [
+    "CACHE_LOOKUP_SECONDS",
+    "POOL_WAIT_SECONDS",
+    "SCRAPE_SECONDS",
+    "JSON_ENCODE_SECONDS",
+    "POOL_SIZE",
+    "POOL_IN_USE",
+    "INFLIGHT_SCRAPES",
+    "metrics_app",
+]
@@ -0,0 +1,318 @@
+"""
+Plain-HTTP fast path for NSE data.
+
+Once a client holds the session cookies NSE sets on its home page, the data
+behind the quote pages can be fetched as JSON from NSE's /api endpoints. That
+skips Chromium entirely; callers fall back to the Playwright scrapers whenever
+this raises FallbackNeeded.
+
+Primed cookies are saved to COOKIE_FILE so later runs (and other processes)
+skip the home-page visit while they are younger than COOKIE_TTL.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+import httpx
+
+NSE_HOME = "https://www.nseindia.com"
+QUOTE_API = NSE_HOME + "/api/quote-equity"
+RESULTS_API = NSE_HOME + "/api/results-comparision"
+
+NSE_UA_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Referer": NSE_HOME + "/",
+}
+
+
+COOKIE_FILE = os.getenv(
+    "NSE_COOKIE_FILE", os.path.join(os.path.dirname(__file__), ".cache", "nse_cookies.json")
+)
+COOKIE_TTL = float(os.getenv("COOKIE_TTL", "600"))
+
+
+class FallbackNeeded(Exception):
+    """The HTTP fast path could not produce complete data; use the browser scraper."""
+
+
+# One client per event loop (httpx clients cannot be shared across loops)
+_client = None
+_client_loop = None
+_warmed = False
+
+
+async def _get_client() -> httpx.AsyncClient:
+    global _client, _client_loop, _warmed
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        # HTTP/1.1: the fast path makes a few sequential JSON calls, so HTTP/2 multiplexing
+        # (which Chromium uses for the page's many resources) gains nothing and would need h2
+        _client = httpx.AsyncClient(
+            http2=False,
+            headers=NSE_UA_HEADERS,
+            timeout=30,
+            follow_redirects=True,
+        )
+        _client_loop = loop
+        _warmed = _load_cookies(_client)
+    if not _warmed:
+        await _warm(_client)
+    return _client
+
+
+def _load_cookies(client: httpx.AsyncClient) -> bool:
+    """Load cookies saved by an earlier run into ``client``; False when missing or stale."""
+    try:
+        with open(COOKIE_FILE, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if time.time() - saved.get("ts", 0) > COOKIE_TTL or not saved.get("cookies"):
+        return False
+    for cookie in saved["cookies"]:
+        client.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"])
+    return True
+
+
+def _save_cookies(client: httpx.AsyncClient):
+    """Write the client's cookies to COOKIE_FILE (temp file + rename, like the response cache)."""
+    cookies = [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+        for c in client.cookies.jar
+    ]
+    directory = os.path.dirname(COOKIE_FILE) or "."
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"ts": time.time(), "cookies": cookies}, f)
+        os.replace(tmp_path, COOKIE_FILE)
+    except OSError as e:
+        print(f"[WARN] Could not save NSE cookies: {e}")
+
+
+async def _warm(client: httpx.AsyncClient):
+    """Visit the NSE home page so the client picks up fresh session cookies."""
+    global _warmed
+    print("[INFO] Priming NSE cookies over HTTP...")
+    response = await client.get(NSE_HOME, headers={"Accept": "text/html,application/xhtml+xml"})
+    if response.status_code >= 400:
+        raise FallbackNeeded(f"NSE home page returned HTTP {response.status_code}")
+    _warmed = True
+    _save_cookies(client)
+
+
+async def fetch_json(url: str, **params):
+    """GET an NSE JSON endpoint, re-priming cookies once on 401/403."""
+    try:
+        client = await _get_client()
+        response = await client.get(url, params=params)
+        if response.status_code in (401, 403):
+            await _warm(client)
+            response = await client.get(url, params=params)
+        if response.status_code != 200:
+            raise FallbackNeeded(f"{url} returned HTTP {response.status_code}")
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        raise FallbackNeeded(f"{url} failed: {e}") from e
+
+
+def _inr(value, decimals: int = 2):
+    """Format a number the way NSE pages show it (Indian digit grouping, e.g. 21,05,517.42)."""
+    if value in (None, "", "-"):
+        return None
+    try:
+        number = float(str(value).replace(",", ""))
+    except ValueError:
+        return str(value)
+    sign = "-" if number < 0 else ""
+    whole, _, frac = f"{abs(number):.{decimals}f}".partition(".")
+    if len(whole) > 3:
+        head, tail = whole[:-3], whole[-3:]
+        groups = []
+        while len(head) > 2:
+            groups.insert(0, head[-2:])
+            head = head[:-2]
+        if head:
+            groups.insert(0, head)
+        whole = ",".join(groups + [tail])
+    return sign + whole + ("." + frac if frac else "")
+
+
+def _put(data: dict, key: str, value):
+    if value not in (None, "", "-"):
+        data[key] = value
+
+
+async def fetch_quote(symbol: str, url: str) -> dict:
+    """
+    Fetch an equity quote from NSE's JSON API.
+
+    Returns a result dict shaped like ``scrape_equity_quote``'s, with ``data``
+    using the same keys as ``parse_nse_quote_html`` except ``returns`` and
+    ``adjusted_pe``: those are only shown on the rendered quote page, so the
+    keys are left out rather than reported empty. Raises FallbackNeeded if NSE refuses
+    the request or the payload is missing the price.
+    """
+    quote = await fetch_json(QUOTE_API, symbol=symbol)
+    price = quote.get("priceInfo") or {}
+    if price.get("lastPrice") in (None, ""):
+        raise FallbackNeeded(f"No price in NSE quote API response for {symbol}")
+
+    try:
+        trade = await fetch_json(QUOTE_API, symbol=symbol, section="trade_info")
+    except FallbackNeeded as e:
+        print(f"[WARN] Trade info unavailable (continuing without it): {e}")
+        trade = {}
+
+    info = quote.get("info") or {}
+    metadata = quote.get("metadata") or {}
+    security = quote.get("securityInfo") or {}
+    intraday = price.get("intraDayHighLow") or {}
+    week = price.get("weekHighLow") or {}
+    book = trade.get("marketDeptOrderBook") or {}
+    trade_info = book.get("tradeInfo") or {}
+    delivery = trade.get("securityWiseDP") or {}
+
+    data = {}
+    _put(data, "symbol", info.get("symbol") or symbol)
+    _put(data, "last_price", _inr(price.get("lastPrice")))
+    _put(data, "change", _inr(price.get("change")))
+    pct = _inr(price.get("pChange"))
+    _put(data, "percent_change", pct + "%" if pct else None)
+    _put(data, "prev_close", _inr(price.get("previousClose")))
+    _put(data, "open", _inr(price.get("open")))
+    _put(data, "high", _inr(intraday.get("max")))
+    _put(data, "low", _inr(intraday.get("min")))
+    _put(data, "vwap", _inr(price.get("vwap")))
+    if price.get("close"):
+        _put(data, "close", _inr(price.get("close")))
+    _put(data, "traded_volume_lakhs", _inr(trade_info.get("totalTradedVolume")))
+    _put(data, "traded_value_cr", _inr(trade_info.get("totalTradedValue")))
+    _put(data, "total_market_cap_cr", _inr(trade_info.get("totalMarketCap")))
+    _put(data, "free_float_market_cap_cr", _inr(trade_info.get("ffmc")))
+    _put(data, "impact_cost", _inr(trade_info.get("impactCost")))
+    _put(data, "face_value", _inr(security.get("faceValue")))
+    _put(data, "52_week_high", _inr(week.get("max")))
+    _put(data, "52_week_low", _inr(week.get("min")))
+    _put(data, "upper_band", _inr(price.get("upperCP")))
+    _put(data, "lower_band", _inr(price.get("lowerCP")))
+    dq = _inr(delivery.get("deliveryToTradedQuantity"))
+    _put(data, "delivery_qty_pct", dq + "%" if dq else None)
+    _put(data, "daily_volatility", _inr(trade_info.get("cmDailyVolatility")))
+    _put(data, "annualised_volatility", _inr(trade_info.get("cmAnnualVolatility")))
+    _put(data, "pe", _inr(metadata.get("pdSymbolPe")))
+    _put(data, "isin", info.get("isin"))
+    _put(data, "listing_date", info.get("listingDate"))
+    _put(data, "industry", (quote.get("industryInfo") or {}).get("basicIndustry"))
+    _put(data, "total_buy_qty", _inr(book.get("totalBuyQuantity"), 0))
+    _put(data, "total_sell_qty", _inr(book.get("totalSellQuantity"), 0))
+
+    return {
+        "status": "success",
+        "url": url,
+        "original_url": url,
+        "screenshot": None,
+        "html": None,
+        "json": None,
+        "data": data,
+        "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+    }
+
+
+# Rows of the results-comparison table: (section, line item, API field, is_total)
+RESULT_ROWS = [
+    ("Revenue from operations", "Revenue from operations", "re_net_sale", False),
+    ("Revenue from operations", "Other income", "re_oth_inc", False),
+    ("Revenue from operations", "Total income", "re_total_inc", True),
+    ("Expenses", "(a) Cost of materials consumed", "re_raw_mat", False),
+    ("Expenses", "(b) Purchases of stock-in-trade", "re_pur_trd_goods", False),
+    ("Expenses", "(c) Changes in inventories of finished goods, work-in-progress and stock-in-trade", "re_inc_dec_in_stock", False),
+    ("Expenses", "(d) Employee benefits expense", "re_staff_cost", False),
+    ("Expenses", "(e) Finance costs", "re_int_new", False),
+    ("Expenses", "(f) Depreciation and amortisation expense", "re_depr_und_exp", False),
+    ("Expenses", "(g) Other expenses", "re_oth_exp", False),
+    ("Expenses", "Total Expenses", "re_oth_tot_exp", True),
+    ("Expenses", "Exceptional items", "re_excepn_items", False),
+    ("Expenses", "Profit / (Loss) before tax", "re_pro_loss_bef_tax", True),
+    ("Tax Expenses", "Current Tax", "re_curr_tax", False),
+    ("Tax Expenses", "Deferred Tax", "re_deff_tax", False),
+    ("Tax Expenses", "Total Tax expense", "re_tax", True),
+    ("Tax Expenses", "Profit / (loss) for the period", "re_net_profit", True),
+    ("Details of equity share capital", "Paid-up equity share capital", "re_pdup", False),
+    ("Details of equity share capital", "Face Value(in Rs.)", "re_face_val", False),
+    ("Earnings per equity share", "Basic EPS for continued and discontinued operations", "re_basic_eps", False),
+    ("Earnings per equity share", "Diluted EPS for continued and discontinued operations", "re_dilut_eps", False),
+]
+
+
+async def fetch_financial_report(symbol: str, url: str) -> dict:
+    """
+    Fetch the last five standalone quarters from NSE's results-comparison API.
+
+    Returns a result dict shaped like ``scrape_with_search``'s, with
+    ``parsed_data`` in ``parse_financial_results``' layout. The report is
+    partial: only the RESULT_ROWS line items are mapped (21 of the rendered
+    page's 46, in 5 of its 12 sections), so ``metadata["partial"]`` is set and
+    the scrapers and the API only use this when asked to (``try_http=True``).
+    Raises FallbackNeeded if no quarters come back.
+    """
+    payload = await fetch_json(RESULTS_API, symbol=symbol)
+    rows = (payload.get("resCmpData") or [])[:5] if isinstance(payload, dict) else []
+    if not rows or all(row.get("re_net_sale") in (None, "") for row in rows):
+        raise FallbackNeeded(f"No results in NSE results-comparison API response for {symbol}")
+
+    sections = []
+    for section_name, name, field, is_total in RESULT_ROWS:
+        if all(field not in row for row in rows):
+            continue
+        if not sections or sections[-1]["section_name"] != section_name:
+            sections.append({"section_name": section_name, "line_items": []})
+        sections[-1]["line_items"].append({
+            "name": name,
+            "values": [_inr(row.get(field)) for row in rows],
+            "is_total": is_total,
+        })
+
+    quarters = [str(row.get("re_to_dt") or "").upper() for row in rows]
+    parsed_data = {
+        "status": "success",
+        "company": {
+            "name": rows[0].get("re_company_name") or "N/A",
+            "symbol": rows[0].get("re_symbol") or symbol,
+        },
+        "quarters": quarters,
+        "audit_status": ["AUDITED" if row.get("re_res_type") == "A" else "UNAUDITED" for row in rows],
+        "currency": "₹ Lakhs",
+        "sections": sections,
+        "metadata": {
+            "total_quarters": len(quarters),
+            "total_sections": len(sections),
+            "note": "For comparison purposes the last 5 quarters of Standalone Results are considered. All Values are in ₹ Lakhs.",
+            "partial": True,
+        },
+    }
+
+    return {
+        "status": "success",
+        "url": url,
+        "search_term": symbol,
+        "screenshot": None,
+        "html": None,
+        "json": None,
+        "parsed_data": parsed_data,
+        "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+    }
+
+
+__all__ = ["FallbackNeeded", "fetch_json", "fetch_quote", "fetch_financial_report"]
@@ -0,0 +1,237 @@
+"""Tests for the Flask API in app.py."""
+
+import asyncio
+import gzip
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import orjson
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_shared_loop_runs_subprocesses_and_threads_under_gevent():
+    # Patching is process-wide, so the check runs in a fresh interpreter (as wsgi.py does)
+    script = textwrap.dedent("""
+        from gevent import monkey
+        monkey.patch_all()
+        import asyncio, sys
+        import app
+
+        async def work():
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, '-c', 'print(42)', stdout=asyncio.subprocess.PIPE
+            )
+            out, _ = await proc.communicate()
+            value = await asyncio.to_thread(lambda: 7)
+            return out.strip().decode(), value
+
+        app.SCRAPE_TIMEOUT = 30
+        print(app.run_shared("gevent-check", work))
+    """)
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "('42', 7)"
+
+
+def test_timed_out_waiter_does_not_cancel_a_shared_scrape(monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, "SCRAPE_TIMEOUT", 1.0)
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(1.5)
+        return "done"
+
+    results = {}
+
+    def wait(name):
+        try:
+            results[name] = app.run_shared("shared-timeout", slow)
+        except TimeoutError:
+            results[name] = "timeout"
+
+    first = threading.Thread(target=wait, args=("first",))
+    first.start()
+    time.sleep(0.8)
+    second = threading.Thread(target=wait, args=("second",))
+    second.start()
+    first.join()
+    second.join()
+
+    assert results == {"first": "timeout", "second": "done"}
+    assert len(calls) == 1
+    assert "shared-timeout" not in app.INFLIGHT
+
+
+def test_last_waiter_timing_out_cancels_the_scrape(monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, "SCRAPE_TIMEOUT", 0.2)
+    cancelled = threading.Event()
+
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        app.run_shared("abandoned", hang)
+    assert cancelled.wait(2)
+    assert "abandoned" not in app.INFLIGHT
+
+
+def test_equity_quote_with_returns_skips_the_http_fast_path(monkeypatch):
+    import app
+
+    async def fast_path(symbol, url):
+        raise AssertionError("fast path used")
+
+    async def browser(scraper, headless, **kwargs):
+        return {"status": "success", "url": kwargs["url"], "data": {"returns": {"1Y": "23.20%"}}, "timestamp": "t"}
+
+    monkeypatch.setattr(app.nse_http, "fetch_quote", fast_path)
+    monkeypatch.setattr(app, "scrape_pooled", browser)
+    body, status = asyncio.run(app.equity_quote("TCS", "https://example.test/tcs", with_returns=True, headless=True))
+    assert status == 200
+    assert body["data"]["returns"] == {"1Y": "23.20%"}
+
+
+def test_unknown_path_is_not_found():
+    import app
+
+    client = app.app.test_client()
+    assert client.get("/no-such-path").status_code == 404
+
+
+def test_preflight_is_answered_for_any_path():
+    import app
+
+    client = app.app.test_client()
+    for path in ("/api/equity-quote", "/no-such-path"):
+        response = client.options(path)
+        assert response.status_code == 204
+        assert response.headers["Access-Control-Allow-Origin"] == "*"
+
+
+CACHED_REPORT = {
+    "status": "success",
+    "symbol": "TCS",
+    "parsed_data": {"status": "success", "sections": [{"section_name": "Income", "line_items": []}] * 50},
+    "timestamp": "20240101_120000",
+}
+
+
+def _serve_cached_report(monkeypatch):
+    import app
+
+    monkeypatch.setattr(app.RESPONSE_CACHE, "get", lambda endpoint, key, ttl: CACHED_REPORT)
+    return app.app.test_client()
+
+
+def test_streamed_scrape_response_is_gzipped_for_gzip_only_clients(monkeypatch):
+    client = _serve_cached_report(monkeypatch)
+    response = client.get("/api/financial-report?symbol=TCS", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert orjson.loads(gzip.decompress(response.get_data())) == CACHED_REPORT
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip", "identity"])
+def test_etag_revalidates_whatever_the_encoding(monkeypatch, encoding):
+    client = _serve_cached_report(monkeypatch)
+    url = "/api/financial-report?symbol=TCS"
+    first = client.get(url, headers={"Accept-Encoding": encoding})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    second = client.get(url, headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.get_data() == b""
+
+
+def test_financial_report_always_renders_the_page(monkeypatch):
+    import app
+
+    async def fast_path(symbol, url):
+        raise AssertionError("partial HTTP report used")
+
+    async def browser(scraper, headless, **kwargs):
+        assert scraper is app.scrape_with_search
+        return {"status": "success", "search_term": kwargs["search_term"], "parsed_data": {"status": "success"}, "timestamp": "t"}
+
+    monkeypatch.setattr(app.nse_http, "fetch_financial_report", fast_path)
+    monkeypatch.setattr(app, "scrape_pooled", browser)
+    body, status = asyncio.run(app.financial_report("TCS", app.FINANCIAL_URL, headless=True))
+    assert status == 200
+    assert body["symbol"] == "TCS"
+
+
+def test_cache_write_failure_still_returns_the_scrape(monkeypatch):
+    import app
+
+    def read_only(*args):
+        raise OSError(30, "Read-only file system")
+
+    async def flow():
+        return {"status": "success"}, 200
+
+    monkeypatch.setattr(app.RESPONSE_CACHE, "set", read_only)
+    assert asyncio.run(app.cached_flow("equity-quote", "key", 60, flow())) == ({"status": "success"}, 200)
+
+
+def test_flight_key_separates_output_dir_and_headless(monkeypatch):
+    import app
+
+    keys = []
+
+    def record(key, make_coro):
+        keys.append(key)
+        return {"status": "error", "error": "stub"}, 500
+
+    monkeypatch.setattr(app, "run_shared", record)
+    client = app.app.test_client()
+    base = "/api/financial-report?symbol=TCS&persist=true"
+    client.get(base + "&output_dir=/tmp/a")
+    client.get(base + "&output_dir=/tmp/b")
+    client.get(base + "&output_dir=/tmp/a&headless=false")
+    assert len(set(keys)) == 3
+
+
+def test_only_successful_scrapes_are_timed(monkeypatch):
+    import app
+    from prometheus_client import REGISTRY
+
+    def timed():
+        return REGISTRY.get_sample_value("nse_scrape_seconds_count", {"endpoint": "financial-report"}) or 0
+
+    outcome = ({"status": "error", "error": "stub"}, 500)
+    monkeypatch.setattr(app, "run_shared", lambda key, make_coro: outcome)
+    client = app.app.test_client()
+    before = timed()
+    client.get("/api/financial-report?symbol=TCS&nocache=true")
+    assert timed() == before
+
+    outcome = ({"status": "success", "symbol": "TCS"}, 200)
+    client.get("/api/financial-report?symbol=TCS&nocache=true")
+    assert timed() == before + 1
+
+
+def test_full_scrape_queue_answers_503_with_retry_after(monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, "MAX_PENDING_SCRAPES", 0)
+    response = app.app.test_client().get("/api/equity-quote?symbol=TCS&name=Tata-Consultancy-Services-Limited&nocache=true")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(app.BUSY_RETRY_AFTER)
+    assert orjson.loads(response.get_data())["status"] == "busy"
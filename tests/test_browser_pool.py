@@ -0,0 +1,90 @@
+"""Tests for the context bookkeeping in browser_pool.BrowserPool."""
+
+import asyncio
+
+import pytest
+
+from browser_pool import BrowserPool
+
+
+def _started_pool(loop, contexts=("ctx",)):
+    """A pool that looks launched on ``loop``, holding ``contexts`` (no real browser)."""
+    pool = BrowserPool(size=len(contexts))
+    pool._loop = loop
+    pool._ready = loop.create_future()
+    pool._ready.set_result(None)
+    pool._contexts = asyncio.Queue()
+    for context in contexts:
+        pool._contexts.put_nowait(context)
+    return pool
+
+
+def test_cancelled_acquire_returns_the_context():
+    async def main():
+        pool = _started_pool(asyncio.get_running_loop())
+        preparing = asyncio.Event()
+
+        async def slow_refresh(context):
+            preparing.set()
+            await asyncio.sleep(60)
+
+        pool._refresh_cookies = slow_refresh
+        task = asyncio.create_task(pool.acquire())
+        await preparing.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return pool._contexts.qsize()
+
+    assert asyncio.run(main()) == 1
+
+
+def test_failed_launch_is_reset_once():
+    async def main():
+        loop = asyncio.get_running_loop()
+        pool = BrowserPool(size=1)
+        resets = []
+        launched = asyncio.Event()
+
+        async def failing_launch():
+            launched.set()
+            await asyncio.sleep(0)
+            raise RuntimeError("no browser")
+
+        async def reset():
+            resets.append(1)
+            pool._loop = pool._ready = None
+
+        pool._launch = failing_launch
+        pool._reset = reset
+        results = await asyncio.gather(pool.acquire(), pool.acquire(), pool.acquire(), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        return len(resets)
+
+    assert asyncio.run(main()) == 1
+
+
+def test_cancelled_waiter_does_not_cancel_the_launch():
+    async def main():
+        pool = BrowserPool(size=1)
+        release = asyncio.Event()
+
+        async def launch():
+            await release.wait()
+            pool._contexts = asyncio.Queue()
+            pool._contexts.put_nowait("ctx")
+
+        async def refresh(context):
+            pass
+
+        pool._launch = launch
+        pool._refresh_cookies = refresh
+        first = asyncio.create_task(pool.acquire())
+        second = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await second
+
+    assert asyncio.run(main()) == "ctx"
@@ -0,0 +1,85 @@
+"""Tests for the TTL caches in cache.py."""
+
+import time
+
+import orjson
+import pytest
+
+from cache import FileCache, RedisCache, make_key
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis client, optionally failing every call."""
+
+    def __init__(self, errors, down=False):
+        self.store = {}
+        self.errors = errors
+        self.down = down
+
+    def get(self, name):
+        if self.down:
+            raise self.errors("connection refused")
+        return self.store.get(name)
+
+    def set(self, name, value, ex=None):
+        if self.down:
+            raise self.errors("connection refused")
+        self.store[name] = value
+
+
+def _redis_cache(tmp_path, down=False):
+    redis = pytest.importorskip("redis")
+    cache = RedisCache("redis://localhost:6379/0", FileCache(str(tmp_path)))
+    cache._redis = FakeRedis(redis.RedisError, down)
+    return cache
+
+
+def test_make_key_depends_on_every_part():
+    assert make_key("url") == make_key("url")
+    assert make_key("url") != make_key("url", "returns")
+
+
+def test_file_cache_round_trip_and_ttl(tmp_path, monkeypatch):
+    cache = FileCache(str(tmp_path))
+    assert cache.get("equity-quote", "k", 60) is None
+    cache.set("equity-quote", "k", {"price": "1,234.50"})
+    assert cache.get("equity-quote", "k", 60) == {"price": "1,234.50"}
+
+    now = time.time()
+    monkeypatch.setattr("cache.time.time", lambda: now + 61)
+    assert cache.get("equity-quote", "k", 60) is None
+    assert cache.get("equity-quote", "k", 120) == {"price": "1,234.50"}
+
+
+def test_file_cache_ignores_corrupt_entries(tmp_path):
+    cache = FileCache(str(tmp_path))
+    (tmp_path / "equity-quote").mkdir()
+    (tmp_path / "equity-quote" / "k.json").write_text("{not json")
+    assert cache.get("equity-quote", "k", 60) is None
+
+
+def test_redis_cache_writes_through_to_the_file_cache(tmp_path):
+    cache = _redis_cache(tmp_path)
+    cache.set("financial-report", "k", {"symbol": "TCS"}, 30)
+    assert cache.get("financial-report", "k", 30) == {"symbol": "TCS"}
+    assert cache.fallback.get("financial-report", "k", 30) == {"symbol": "TCS"}
+    assert orjson.loads(cache._redis.store["nse-cache:financial-report:k"])["payload"] == {"symbol": "TCS"}
+
+
+def test_redis_cache_honours_the_ttl(tmp_path, monkeypatch):
+    cache = _redis_cache(tmp_path)
+    cache.set("equity-quote", "k", {"symbol": "TCS"}, 60)
+    now = time.time()
+    monkeypatch.setattr("cache.time.time", lambda: now + 61)
+    assert cache.get("equity-quote", "k", 60) is None
+
+
+def test_redis_cache_falls_back_to_files_on_a_miss_or_outage(tmp_path):
+    cache = _redis_cache(tmp_path)
+    cache.fallback.set("equity-quote", "k", {"symbol": "INFY"})
+    assert cache.get("equity-quote", "k", 60) == {"symbol": "INFY"}
+
+    cache._redis.down = True
+    assert cache.get("equity-quote", "k", 60) == {"symbol": "INFY"}
+    cache.set("equity-quote", "k2", {"symbol": "TCS"}, 60)
+    assert cache.get("equity-quote", "k2", 60) == {"symbol": "TCS"}
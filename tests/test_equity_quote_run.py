@@ -0,0 +1,39 @@
+"""Tests for the quote page parser in equity_quote_run.py."""
+
+import glob
+import os
+
+import pytest
+
+import equity_quote_run
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUOTE_PAGES = sorted(glob.glob(os.path.join(ROOT, "output", "*_quote_*.html")))
+
+RETURNS_HTML = """
+<html><body><main id="midBody">
+  <div>Stock Absolute Returns NIFTY 50 Absolute Returns</div>
+  <div>1M 2.94% 0.67%</div>
+  <div>YTD -8.15% 9.71%</div>
+  <div>1Y -12.30% 6.11%</div>
+  <div>3Y 19.08% -0.82%</div>
+</main></body></html>
+"""
+
+
+def test_returns_keep_negative_periods():
+    data = equity_quote_run.parse_nse_quote_html(RETURNS_HTML)
+    assert data["returns"] == {"1M": "2.94%", "YTD": "-8.15%", "1Y": "-12.30%", "3Y": "19.08%"}
+
+
+@pytest.mark.skipif(equity_quote_run.HTMLParser is None, reason="selectolax not installed")
+@pytest.mark.parametrize("path", QUOTE_PAGES, ids=os.path.basename)
+def test_lexbor_and_soup_parsers_agree(path, monkeypatch):
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    lexbor = equity_quote_run.parse_nse_quote_html(html)
+    monkeypatch.setattr(equity_quote_run, "HTMLParser", None)
+    soup = equity_quote_run.parse_nse_quote_html(html)
+    assert lexbor == soup
+    assert list(lexbor) == list(soup)
+    assert lexbor
@@ -0,0 +1,26 @@
+"""Tests for the results-comparison parser in finiancialReport.py."""
+
+import glob
+import os
+
+import orjson
+import pytest
+
+import finiancialReport
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_PAGES = sorted(glob.glob(os.path.join(ROOT, "output", "*_page_*.html")))
+
+
+@pytest.mark.skipif(finiancialReport.HTMLParser is None, reason="selectolax not installed")
+@pytest.mark.parametrize("path", RESULT_PAGES, ids=os.path.basename)
+def test_lexbor_and_soup_parsers_agree(path, monkeypatch):
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    lexbor = finiancialReport.parse_financial_results(html)
+    monkeypatch.setattr(finiancialReport, "HTMLParser", None)
+    soup = finiancialReport.parse_financial_results(html)
+    # Compared as JSON so key order counts too
+    assert orjson.dumps(lexbor) == orjson.dumps(soup)
+    assert lexbor["status"] == "success"
+    assert lexbor["sections"]
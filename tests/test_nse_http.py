@@ -0,0 +1,131 @@
+"""Tests for the JSON-to-page mappings in nse_http.py (no network: fetch_json is faked)."""
+
+import asyncio
+
+import pytest
+
+import nse_http
+
+
+@pytest.mark.parametrize("value, decimals, expected", [
+    (2105517.42, 2, "21,05,517.42"),
+    (-2105517.42, 2, "-21,05,517.42"),
+    ("1,23,45,678", 2, "1,23,45,678.00"),
+    (999.5, 2, "999.50"),
+    (-12.3, 2, "-12.30"),
+    (1000, 0, "1,000"),
+    (0, 2, "0.00"),
+    (None, 2, None),
+    ("", 2, None),
+    ("-", 2, None),
+    ("NA", 2, "NA"),
+])
+def test_inr_uses_indian_digit_grouping(value, decimals, expected):
+    assert nse_http._inr(value, decimals) == expected
+
+
+QUOTE = {
+    "info": {"symbol": "TCS", "isin": "INE467B01029", "listingDate": "25-Aug-2004"},
+    "metadata": {"pdSymbolPe": 29.87},
+    "securityInfo": {"faceValue": 1},
+    "industryInfo": {"basicIndustry": "Computers - Software & Consulting"},
+    "priceInfo": {
+        "lastPrice": 3254.6, "change": -41.25, "pChange": -1.2516, "previousClose": 3295.85,
+        "open": 3290, "close": 0, "vwap": 3261.02,
+        "intraDayHighLow": {"min": 3240.1, "max": 3299},
+        "weekHighLow": {"min": 2991.6, "max": 4592.25},
+        "upperCP": "3625.40", "lowerCP": "2966.30",
+    },
+}
+TRADE = {
+    "marketDeptOrderBook": {
+        "totalBuyQuantity": 123456, "totalSellQuantity": 7890,
+        "tradeInfo": {
+            "totalTradedVolume": 21.05, "totalTradedValue": 685.9,
+            "totalMarketCap": 1177562.4, "ffmc": 328765.1, "impactCost": 0.01,
+            "cmDailyVolatility": "1.41", "cmAnnualVolatility": "26.94",
+        },
+    },
+    "securityWiseDP": {"deliveryToTradedQuantity": 58.7},
+}
+
+
+def _fake_fetch_json(responses):
+    async def fetch_json(url, **params):
+        response = responses[(url, params.get("section"))]
+        if isinstance(response, Exception):
+            raise response
+        return response
+    return fetch_json
+
+
+def test_fetch_quote_maps_the_page_fields(monkeypatch):
+    monkeypatch.setattr(nse_http, "fetch_json", _fake_fetch_json({
+        (nse_http.QUOTE_API, None): QUOTE,
+        (nse_http.QUOTE_API, "trade_info"): TRADE,
+    }))
+    result = asyncio.run(nse_http.fetch_quote("TCS", "https://www.nseindia.com/get-quotes/equity?symbol=TCS"))
+    data = result["data"]
+    assert result["status"] == "success"
+    assert data["last_price"] == "3,254.60"
+    assert data["change"] == "-41.25"
+    assert data["percent_change"] == "-1.25%"
+    assert data["total_market_cap_cr"] == "11,77,562.40"
+    assert data["delivery_qty_pct"] == "58.70%"
+    assert data["upper_band"] == "3,625.40"
+    assert data["total_buy_qty"] == "1,23,456"
+    assert data["pe"] == "29.87"
+    assert data["industry"] == "Computers - Software & Consulting"
+    # Not in the API, and a zero close means the market is still open
+    assert "returns" not in data and "adjusted_pe" not in data and "close" not in data
+
+
+def test_fetch_quote_survives_missing_trade_info(monkeypatch):
+    monkeypatch.setattr(nse_http, "fetch_json", _fake_fetch_json({
+        (nse_http.QUOTE_API, None): QUOTE,
+        (nse_http.QUOTE_API, "trade_info"): nse_http.FallbackNeeded("HTTP 403"),
+    }))
+    data = asyncio.run(nse_http.fetch_quote("TCS", "url"))["data"]
+    assert data["last_price"] == "3,254.60"
+    assert "traded_volume_lakhs" not in data
+
+
+def test_fetch_quote_without_a_price_falls_back(monkeypatch):
+    monkeypatch.setattr(nse_http, "fetch_json", _fake_fetch_json({
+        (nse_http.QUOTE_API, None): {"info": {"symbol": "TCS"}, "priceInfo": {}},
+    }))
+    with pytest.raises(nse_http.FallbackNeeded):
+        asyncio.run(nse_http.fetch_quote("TCS", "url"))
+
+
+def _quarter(to_date, net_sale, res_type="A"):
+    return {
+        "re_to_dt": to_date, "re_res_type": res_type, "re_company_name": "Tata Consultancy Services Limited",
+        "re_symbol": "TCS", "re_net_sale": net_sale, "re_oth_inc": 98000, "re_total_inc": net_sale + 98000,
+        "re_basic_eps": 33.28,
+    }
+
+
+def test_fetch_financial_report_maps_result_rows(monkeypatch):
+    rows = [_quarter("30-Sep-2025", 5216500), _quarter("30-Jun-2025", 5142300, "U")]
+    monkeypatch.setattr(nse_http, "fetch_json", _fake_fetch_json({
+        (nse_http.RESULTS_API, None): {"resCmpData": rows},
+    }))
+    parsed = asyncio.run(nse_http.fetch_financial_report("TCS", "url"))["parsed_data"]
+    assert parsed["company"] == {"name": "Tata Consultancy Services Limited", "symbol": "TCS"}
+    assert parsed["quarters"] == ["30-SEP-2025", "30-JUN-2025"]
+    assert parsed["audit_status"] == ["AUDITED", "UNAUDITED"]
+    assert parsed["metadata"]["partial"] is True
+    # Only rows the API returned are mapped
+    assert [s["section_name"] for s in parsed["sections"]] == ["Revenue from operations", "Earnings per equity share"]
+    revenue = parsed["sections"][0]["line_items"]
+    assert revenue[0] == {"name": "Revenue from operations", "values": ["52,16,500.00", "51,42,300.00"], "is_total": False}
+    assert revenue[2]["is_total"] is True
+
+
+def test_fetch_financial_report_without_quarters_falls_back(monkeypatch):
+    monkeypatch.setattr(nse_http, "fetch_json", _fake_fetch_json({
+        (nse_http.RESULTS_API, None): {"resCmpData": []},
+    }))
+    with pytest.raises(nse_http.FallbackNeeded):
+        asyncio.run(nse_http.fetch_financial_report("TCS", "url"))
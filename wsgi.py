@@ -0,0 +1,15 @@
+"""
+WSGI entry point for gunicorn with gevent workers.
+
+Patches the standard library for cooperative sockets before the app (and the
+scrapers it imports) is loaded:
+    gunicorn -k gevent -w 2 --worker-connections 1000 wsgi:app
+"""
+
+from gevent import monkey
+
+monkey.patch_all()
+
+from app import app  # noqa: E402
+
+__all__ = ["app"]